@@ -1,99 +1,58 @@
 import streamlit as st
-import json
 import html
+import os
 import re
-import threading
 import time
-import schedule
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import urllib.parse
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 from database import (
     init_database,
     get_leads_filtered,
     get_lead_count,
     get_leads_today_count,
-    dismiss_lead,
+    dismiss_leads,
 )
 from monitor import ScraperMonitor
+from utils import json_dumps, json_loads
 
-# Global flag for thread control (not in session_state - threads can't access it)
-_scheduler_running = False
-_scheduler_lock = threading.Lock()
+# Leads rendered per dashboard page
+LEADS_PER_PAGE = 10
 
-# Page config
-st.set_page_config(page_title="PR Lead Bot Dashboard", page_icon="🤖", layout="wide")
-
-# Initialize
-if "monitor" not in st.session_state:
-    init_database()
-    st.session_state.monitor = ScraperMonitor()
-    st.session_state.scheduler_thread = None
-
-monitor = st.session_state.monitor
-
-
-def run_scheduler_loop():
-    """Background thread that runs the scheduler"""
-    global _scheduler_running
-    while True:
-        with _scheduler_lock:
-            if not _scheduler_running:
-                break
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
-
-
-def start_background_scheduler(monitor_instance, interval_hours):
-    """Start the scheduler in a background thread"""
-    global _scheduler_running
-
-    with _scheduler_lock:
-        if _scheduler_running:
-            return  # Already running
+# Strips HTML tags from post content before rendering
+_TAG_RE = re.compile(r"<[^>]+>")
 
-        # Clear any existing scheduled jobs
-        schedule.clear()
-
-        # Schedule the job
-        schedule.every(interval_hours).hours.do(monitor_instance.run_scraper_job)
-
-        # Calculate initial next run time
-        monitor_instance.next_run_time = time.time() + (interval_hours * 3600)
-
-        # Start background thread
-        _scheduler_running = True
-
-    st.session_state.scheduler_thread = threading.Thread(
-        target=run_scheduler_loop, daemon=True
-    )
-    st.session_state.scheduler_thread.start()
+# Matched-filter pill markup; cls selects the pill-* color class
+_PILL_TPL = '<span class="matched-pill pill-{cls}">{icon} {val}</span>'
 
+# Page config
+st.set_page_config(page_title="PR Lead Bot Dashboard", page_icon="🤖", layout="wide")
 
-def stop_background_scheduler():
-    """Stop the background scheduler"""
-    global _scheduler_running
 
-    with _scheduler_lock:
-        _scheduler_running = False
+@st.cache_resource
+def get_monitor() -> ScraperMonitor:
+    """Shared ScraperMonitor, created once per server process (not per session)"""
+    init_database()
+    return ScraperMonitor()
 
-    schedule.clear()
-    st.session_state.scheduler_thread = None
 
+# Initialize
+monitor = get_monitor()
 
-def is_scheduler_running():
-    """Check if scheduler is currently running"""
-    global _scheduler_running
-    with _scheduler_lock:
-        return _scheduler_running
+# Show toasts queued before an st.rerun() (a toast emitted right before a
+# rerun is dropped, which is what the old blocking sleeps worked around)
+if "pending_toast" in st.session_state:
+    toast_message, toast_icon = st.session_state.pop("pending_toast")
+    st.toast(toast_message, icon=toast_icon)
 
 
 # Auto-start scheduler if monitoring was previously enabled
 if "scheduler_initialized" not in st.session_state:
     st.session_state.scheduler_initialized = True
     config = monitor.load_config()
-    if config.get("monitoring", {}).get("active", False) and not is_scheduler_running():
+    if config.get("monitoring", {}).get("active", False):
         interval_hours = config.get("monitoring", {}).get("interval_hours", 1)
-        start_background_scheduler(monitor, interval_hours)
+        monitor.start_background_scheduler(interval_hours)
 
 # Custom CSS
 st.markdown(
@@ -140,6 +99,28 @@ st.markdown(
         margin-bottom: 12px;
     }
 
+    /* View/Contact links rendered inside the card (no widget round-trip) */
+    .lead-actions {
+        margin-top: 14px;
+    }
+
+    .lead-action {
+        display: inline-block;
+        padding: 6px 14px;
+        margin-right: 8px;
+        border-radius: 6px;
+        border: 1px solid #1976d2;
+        color: #1976d2 !important;
+        text-decoration: none !important;
+        font-size: 0.9em;
+        font-weight: 500;
+    }
+
+    .lead-action-primary {
+        background-color: #1976d2;
+        color: #ffffff !important;
+    }
+
     /* Filter pill styling with distinct colors */
     .matched-pill {
         display: inline-block;
@@ -207,80 +188,131 @@ st.sidebar.header("⚙️ Bot Configuration")
 
 
 # Load config
+@st.cache_data(show_spinner=False)
+def _read_config(mtime: float) -> Dict[str, Any]:
+    """Parse config.json (cached until the file's mtime changes)"""
+    with open("config.json", "rb") as f:
+        return json_loads(f.read())
+
+
 def load_config() -> Dict[str, Any]:
     """Load configuration from config.json"""
-    with open("config.json", "r") as f:
-        return json.load(f)
+    return _read_config(os.path.getmtime("config.json"))
 
 
 def save_config(config: Dict[str, Any]) -> None:
     """Save configuration to config.json"""
-    with open("config.json", "w") as f:
-        json.dump(config, f, indent=2)
+    with open("config.json", "w", encoding="utf-8") as f:
+        f.write(json_dumps(config, indent=True))
+    _read_config.clear()
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_lead_count() -> int:
+    """Total lead count (refreshed at most every 15s)"""
+    return get_lead_count()
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_today_count() -> int:
+    """Today's lead count (refreshed at most every 15s)"""
+    return get_leads_today_count()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_leads(
+    platform: str,
+    category: Optional[str],
+    role: Optional[str],
+    keyword: Optional[str],
+    search_text: Optional[str],
+    date_range_hours: Optional[int],
+    limit: int,
+    after: Optional[Tuple[str, int]],
+) -> List[Dict[str, Any]]:
+    """Filtered leads (reused across reruns while the filters are unchanged)"""
+    return get_leads_filtered(
+        platform=platform,
+        category=category,
+        role=role,
+        keyword=keyword,
+        search_text=search_text,
+        include_dismissed=False,
+        date_range_hours=date_range_hours,
+        limit=limit,
+        after=after,
+    )
 
 
-config = load_config()
+def save_config_section(section: str, form_key: str) -> None:
+    """Form submit callback: apply a sidebar list editor's edits in one write
 
-# PR Intent Keywords
-st.sidebar.subheader("🔍 PR Intent Keywords")
-pr_keywords = config.get("keywords", [])
-new_keyword = st.sidebar.text_input("Add keyword:", key="new_pr_keyword")
-if st.sidebar.button("➕ Add", key="add_pr_keyword") and new_keyword:
-    if new_keyword not in pr_keywords:
-        pr_keywords.append(new_keyword)
-        config["keywords"] = pr_keywords
+    Items whose "keep" checkbox was unticked are dropped and the add field's
+    value is appended. Callbacks run before the script reruns, so the single
+    rerun Streamlit performs for the submit already renders the new config.
+    """
+    config = load_config()
+    items = [
+        item
+        for item in config.get(section, [])
+        if st.session_state.get(f"{form_key}_keep_{item}", True)
+    ]
+    new_item = (st.session_state.get(f"{form_key}_new") or "").strip()
+    if new_item and new_item not in items:
+        items.append(new_item)
+
+    if items != config.get(section, []):
+        config[section] = items
         save_config(config)
-        st.rerun()
 
-# Display current keywords
-for i, keyword in enumerate(pr_keywords):
-    col1, col2 = st.sidebar.columns([4, 1])
-    col1.write(f"• {keyword}")
-    if col2.button("❌", key=f"del_pr_{i}"):
-        pr_keywords.remove(keyword)
-        config["keywords"] = pr_keywords
-        save_config(config)
-        st.rerun()
 
-# Role Keywords
-st.sidebar.subheader("👔 Role Keywords")
-role_keywords = config.get("job_titles", [])
-new_role = st.sidebar.text_input("Add role:", key="new_role")
-if st.sidebar.button("➕ Add", key="add_role") and new_role:
-    if new_role not in role_keywords:
-        role_keywords.append(new_role)
-        config["job_titles"] = role_keywords
-        save_config(config)
-        st.rerun()
+def render_config_list_editor(
+    section: str, form_key: str, title: str, add_label: str
+) -> None:
+    """Sidebar form listing a config section with keep checkboxes and an add field
+
+    Nothing reruns while the user ticks or types; one Save applies every edit.
+    """
+    st.sidebar.subheader(title)
+    with st.sidebar.form(form_key, clear_on_submit=True):
+        st.text_input(add_label, key=f"{form_key}_new")
+        for item in config.get(section, []):
+            st.checkbox(item, value=True, key=f"{form_key}_keep_{item}")
+        st.form_submit_button(
+            "💾 Save", on_click=save_config_section, args=(section, form_key)
+        )
+
+
+def show_older_leads(last_key: Tuple[str, int]) -> None:
+    """Button callback: page forward, starting after the last lead shown"""
+    st.session_state.leads_page_keys.append(last_key)
+
+
+def show_newer_leads() -> None:
+    """Button callback: page back to the previous page's starting position"""
+    st.session_state.leads_page_keys.pop()
 
-for i, role in enumerate(role_keywords):
-    col1, col2 = st.sidebar.columns([4, 1])
-    col1.write(f"• {role}")
-    if col2.button("❌", key=f"del_role_{i}"):
-        role_keywords.remove(role)
-        config["job_titles"] = role_keywords
-        save_config(config)
-        st.rerun()
 
-# CPG Categories
-st.sidebar.subheader("🏭 CPG Categories")
+def clear_lead_caches() -> None:
+    """Invalidate cached lead queries after the leads table changes"""
+    _cached_lead_count.clear()
+    _cached_today_count.clear()
+    _fetch_leads.clear()
+
+
+config = load_config()
+pr_keywords = config.get("keywords", [])
+role_keywords = config.get("job_titles", [])
 cpg_categories = config.get("industries", [])
-new_category = st.sidebar.text_input("Add category:", key="new_category")
-if st.sidebar.button("➕ Add", key="add_category") and new_category:
-    if new_category not in cpg_categories:
-        cpg_categories.append(new_category)
-        config["industries"] = cpg_categories
-        save_config(config)
-        st.rerun()
 
-for i, category in enumerate(cpg_categories):
-    col1, col2 = st.sidebar.columns([4, 1])
-    col1.write(f"• {category}")
-    if col2.button("❌", key=f"del_cat_{i}"):
-        cpg_categories.remove(category)
-        config["industries"] = cpg_categories
-        save_config(config)
-        st.rerun()
+# Untick an item to remove it, or type a new one, then Save
+render_config_list_editor(
+    "keywords", "pr_keywords_form", "🔍 PR Intent Keywords", "Add keyword:"
+)
+render_config_list_editor("job_titles", "roles_form", "👔 Role Keywords", "Add role:")
+render_config_list_editor(
+    "industries", "categories_form", "🏭 CPG Categories", "Add category:"
+)
 
 # Monitoring Status
 st.header("📊 Monitoring Status")
@@ -290,11 +322,11 @@ status = monitor.get_monitoring_status()
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    total_leads = get_lead_count()
+    total_leads = _cached_lead_count()
     st.metric("Total Leads", total_leads)
 
 with col2:
-    today_leads = get_leads_today_count()
+    today_leads = _cached_today_count()
     st.metric("Today", today_leads)
 
 with col3:
@@ -331,25 +363,23 @@ with col1:
         monitor.start_monitoring()
         config = monitor.load_config()
         interval_hours = config.get("monitoring", {}).get("interval_hours", 1)
-        start_background_scheduler(monitor, interval_hours)
-        st.toast("✅ Monitoring started!", icon="✅")
-        time.sleep(1)
+        monitor.start_background_scheduler(interval_hours)
+        st.session_state.pending_toast = ("✅ Monitoring started!", "✅")
         st.rerun()
 
 with col2:
     if st.button("⏸️ Stop Monitoring", use_container_width=True):
         monitor.stop_monitoring()
-        stop_background_scheduler()
-        st.toast("⏸️ Monitoring stopped", icon="⚠️")
-        time.sleep(1)
+        monitor.stop_background_scheduler()
+        st.session_state.pending_toast = ("⏸️ Monitoring stopped", "⚠️")
         st.rerun()
 
 with col3:
     if st.button("🔄 Run Once", use_container_width=True):
         with st.spinner("Running scraper..."):
             monitor.run_once()
-        st.toast("✅ Scrape completed!", icon="✅")
-        time.sleep(2)
+        clear_lead_caches()
+        st.session_state.pending_toast = ("✅ Scrape completed!", "✅")
         st.rerun()
 
 # Recent Leads
@@ -384,167 +414,197 @@ with col5:
     search_text = st.text_input("🔍 Search posts", key="search_text")
 
 # Get filtered leads
-filter_params = {"platform": "twitter", "include_dismissed": False, "limit": 50}
-
-if filter_category and filter_category != "All":
-    filter_params["category"] = filter_category
-
-if filter_role and filter_role != "All":
-    filter_params["role"] = filter_role
-
-if filter_keyword and filter_keyword != "All":
-    filter_params["keyword"] = filter_keyword
-
-# Convert date range to hours
-if date_range and date_range != "All Time":
-    date_range_map = {
-        "Last 4 hours": 4,
-        "Last 24 hours": 24,
-        "Last Week": 24 * 7,
-        "Last Month": 24 * 30,
-    }
-    filter_params["date_range_hours"] = date_range_map.get(date_range)
-
-if search_text:
-    filter_params["search_text"] = search_text
+date_range_map = {
+    "Last 4 hours": 4,
+    "Last 24 hours": 24,
+    "Last Week": 24 * 7,
+    "Last Month": 24 * 30,
+}
+lead_filters = dict(
+    platform="twitter",
+    category=filter_category if filter_category != "All" else None,
+    role=filter_role if filter_role != "All" else None,
+    keyword=filter_keyword if filter_keyword != "All" else None,
+    search_text=search_text or None,
+    date_range_hours=date_range_map.get(date_range),
+)
 
-leads = get_leads_filtered(**filter_params)
+# Keyset paging: one (created_at, id) start position per page visited, so
+# each page seeks in the index instead of skipping OFFSET rows. Changing any
+# filter goes back to the first page.
+if st.session_state.get("leads_page_filters") != lead_filters:
+    st.session_state.leads_page_filters = lead_filters
+    st.session_state.leads_page_keys = [None]
+page_keys = st.session_state.leads_page_keys
+page = len(page_keys)
+
+leads = _fetch_leads(
+    **lead_filters,
+    # One extra row tells us whether a next page exists
+    limit=LEADS_PER_PAGE + 1,
+    after=page_keys[-1],
+)
+has_next_page = len(leads) > LEADS_PER_PAGE
+leads = leads[:LEADS_PER_PAGE]
 
 # Display leads
 if not leads:
-    st.info("No leads found. Try adjusting filters or run the scraper.")
+    if page > 1:
+        st.info("No more leads. Go back a page or adjust filters.")
+    else:
+        st.info("No leads found. Try adjusting filters or run the scraper.")
 else:
-    st.write(f"Showing {len(leads)} lead(s)")
+    first_shown = (page - 1) * LEADS_PER_PAGE + 1
+    more_note = " (more on next page)" if has_next_page else ""
+    st.write(
+        f"Showing leads {first_shown}-{first_shown + len(leads) - 1}{more_note}"
+    )
+
+    # Dismiss checkboxes live in a form: ticking them doesn't rerun the script,
+    # and one submit dismisses every selected lead in a single transaction
+    dismiss_form = st.form("dismiss_leads_form", border=False)
+    selected_lead_ids = []
 
     for lead in leads:
-        # Parse matched filters
-        matched_keywords = json.loads(lead.get("matched_keywords") or "[]")
-        matched_roles = json.loads(lead.get("matched_roles") or "[]")
-        matched_categories = json.loads(lead.get("matched_categories") or "[]")
-
-        # Create card with custom styling
-        with st.container():
-            # Build entire lead card as HTML
-            author_name = html.escape(lead.get("author_name") or "Unknown")
-            author_username_raw = lead.get("author_username") or ""
-            author_username = html.escape(author_username_raw.strip())
-
-            if author_username:
-                author_display = f'<div class="lead-header">{author_name}</div><div class="lead-meta">{author_username}</div>'
+        # Matched filters arrive already decoded from get_leads_filtered
+        matched_keywords = lead["matched_keywords"]
+        matched_roles = lead["matched_roles"]
+        matched_categories = lead["matched_categories"]
+
+        # Build entire lead card as HTML
+        author_name = html.escape(lead.get("author_name") or "Unknown")
+        author_username_raw = lead.get("author_username") or ""
+        author_username = html.escape(author_username_raw.strip())
+
+        if author_username:
+            author_display = f'<div class="lead-header">{author_name}</div><div class="lead-meta">{author_username}</div>'
+        else:
+            author_display = f'<div class="lead-header">{author_name}</div>'
+
+        # Post content preview
+        content = lead.get("post_content") or ""
+        # Strip any HTML tags first
+        content_clean = _TAG_RE.sub("", content).strip()
+        preview_text = (
+            content_clean[:300] + "..."
+            if len(content_clean) > 300
+            else content_clean
+        )
+
+        # Timestamp - time since the post, precomputed by SQLite (age_seconds)
+        age_seconds = lead.get("age_seconds")
+        if age_seconds is None:
+            time_str = "recently"
+        else:
+            days, day_seconds = divmod(max(age_seconds, 0), 86400)
+            if days > 0:
+                time_str = f"{days}d ago"
+            elif day_seconds >= 3600:
+                time_str = f"{day_seconds // 3600}h ago"
             else:
-                author_display = f'<div class="lead-header">{author_name}</div>'
-
-            # Post content preview
-            content = lead.get("post_content") or ""
-            # Strip any HTML tags first
-            content_clean = re.sub(r"<[^>]+>", "", content).strip()
-            preview_text = (
-                content_clean[:300] + "..."
-                if len(content_clean) > 300
-                else content_clean
+                time_str = f"{day_seconds // 60}m ago"
+
+        # Budget, falling back to raw_data's budget_mentions (resolved in the query)
+        budget_mention = lead.get("budget_mention")
+        budget_str = f" • 💰 {budget_mention}" if budget_mention else ""
+
+        # Add timestamp and budget to preview text, then escape once for XSS protection
+        footer_text = ""
+        if time_str or budget_str:
+            footer_text = f"\n\nPosted {time_str}{budget_str}" if time_str else f"\n\n{budget_str}"
+        preview_text = f"{preview_text}{footer_text}"
+        preview_escaped = html.escape(preview_text)
+
+        # Matched filters with vibrant pills (HTML escaped for XSS protection)
+        matches_html = ""
+        if matched_keywords or matched_roles or matched_categories:
+            pills = "".join(
+                _PILL_TPL.format_map(
+                    {"cls": cls, "icon": icon, "val": html.escape(str(value))}
+                )
+                for cls, icon, values in (
+                    ("keyword", "🔍", matched_keywords),
+                    ("role", "👔", matched_roles),
+                    ("category", "🏭", matched_categories),
+                )
+                for value in values
+            )
+            matches_html = f"<div style='margin-top: 12px;'>{pills}</div>"
+
+        # View/Contact open in a new tab, so plain links inside the card HTML
+        # replace two st.link_button widgets per lead
+        action_links = []
+        post_url = lead.get("post_url") or ""
+        if post_url.startswith(("http://", "https://")):
+            action_links.append(
+                f'<a class="lead-action lead-action-primary" href="{html.escape(post_url)}" '
+                f'target="_blank" rel="noopener noreferrer">👁️ View Post</a>'
             )
 
-            # Timestamp - calculate time ago using created_at (post timestamp)
-            time_str = ""
-            created_at = lead.get("created_at", "") or lead.get("scraped_at", "")
-            if created_at:
-                try:
-                    dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                    time_ago = datetime.now() - dt
-                    if time_ago.days > 0:
-                        time_str = f"{time_ago.days}d ago"
-                    elif time_ago.seconds // 3600 > 0:
-                        time_str = f"{time_ago.seconds // 3600}h ago"
-                    else:
-                        time_str = f"{time_ago.seconds // 60}m ago"
-                except Exception:
-                    time_str = "recently"
-
-            # Extract budget from raw_data if available
-            budget_str = ""
-            budget_mention = lead.get("budget_mention")
-            if not budget_mention and lead.get("raw_data"):
-                try:
-                    raw_data = json.loads(lead["raw_data"])
-                    budget_mentions = raw_data.get("budget_mentions", [])
-                    if budget_mentions:
-                        budget_str = f" • 💰 {budget_mentions[0]}"
-                except Exception:
-                    pass
-            elif budget_mention:
-                budget_str = f" • 💰 {budget_mention}"
-
-            # Add timestamp and budget to preview text, then escape once for XSS protection
-            footer_text = ""
-            if time_str or budget_str:
-                footer_text = f"\n\nPosted {time_str}{budget_str}" if time_str else f"\n\n{budget_str}"
-            preview_text = f"{preview_text}{footer_text}"
-            preview_escaped = html.escape(preview_text)
-
-            # Matched filters with vibrant pills (HTML escaped for XSS protection)
-            matches_html = ""
-            if matched_keywords or matched_roles or matched_categories:
-                matches_html = "<div style='margin-top: 12px;'>"
-                for kw in matched_keywords:
-                    kw_escaped = html.escape(str(kw))
-                    matches_html += f'<span class="matched-pill pill-keyword">🔍 {kw_escaped}</span>'
-                for role in matched_roles:
-                    role_escaped = html.escape(str(role))
-                    matches_html += (
-                        f'<span class="matched-pill pill-role">👔 {role_escaped}</span>'
-                    )
-                for cat in matched_categories:
-                    cat_escaped = html.escape(str(cat))
-                    matches_html += f'<span class="matched-pill pill-category">🏭 {cat_escaped}</span>'
-                matches_html += "</div>"
-
-            # Render as two columns with lead card only wrapping left content
-            col1, col2 = st.columns([5, 1])
-
-            with col1:
-                full_card_html = f"""
-                <div class="lead-card">
-                    {author_display}
-                    <div class="lead-content">{preview_escaped}</div>
-                    {matches_html}
-                </div>
-                """
-                try:
-                    st.html(full_card_html)
-                except AttributeError:
-                    # Fallback for older Streamlit versions
-                    st.markdown(full_card_html, unsafe_allow_html=True)
-
-            with col2:
-                # Actions with improved styling
-                post_url = lead.get('post_url', '')
-                if post_url:
-                    st.link_button(
-                        "👁️ View Post",
-                        url=post_url,
-                        type="primary",
-                        use_container_width=True,
-                    )
-
-                # Contact button - opens Twitter profile
-                author_username = lead.get('author_username', '')
-                if author_username:
-                    # Construct Twitter profile URL (remove @ if present)
-                    username_clean = author_username.lstrip('@')
-                    profile_url = f"https://twitter.com/{username_clean}"
-                    st.link_button(
-                        "💬 Contact",
-                        url=profile_url,
-                        use_container_width=True,
-                    )
-
-                if st.button(
-                    "🗑️ Dismiss", key=f"dismiss_{lead['id']}", use_container_width=True
-                ):
-                    dismiss_lead(lead["id"])
-                    st.rerun()
-
-            st.divider()
+        # Contact link - opens Twitter profile (remove @ if present)
+        if author_username_raw:
+            username_clean = urllib.parse.quote(author_username_raw.strip().lstrip("@"))
+            profile_url = f"https://twitter.com/{username_clean}"
+            action_links.append(
+                f'<a class="lead-action" href="{profile_url}" '
+                f'target="_blank" rel="noopener noreferrer">💬 Contact</a>'
+            )
+
+        actions_html = (
+            f'<div class="lead-actions">{"".join(action_links)}</div>'
+            if action_links
+            else ""
+        )
+
+        # Render as two columns with lead card only wrapping left content
+        col1, col2 = dismiss_form.columns([5, 1])
+
+        with col1:
+            full_card_html = f"""
+            <div class="lead-card">
+                {author_display}
+                <div class="lead-content">{preview_escaped}</div>
+                {matches_html}
+                {actions_html}
+            </div>
+            """
+            try:
+                st.html(full_card_html)
+            except AttributeError:
+                # Fallback for older Streamlit versions
+                st.markdown(full_card_html, unsafe_allow_html=True)
+
+        if col2.checkbox("🗑️ Dismiss", key=f"dismiss_{lead['id']}"):
+            selected_lead_ids.append(lead["id"])
+
+    if dismiss_form.form_submit_button("🗑️ Dismiss selected", use_container_width=True):
+        if selected_lead_ids:
+            dismiss_leads(selected_lead_ids)
+            clear_lead_caches()
+            st.session_state.pending_toast = (
+                f"Dismissed {len(selected_lead_ids)} lead(s)",
+                "🗑️",
+            )
+            st.rerun()
+
+# Page navigation
+if page > 1 or has_next_page:
+    col1, col2 = st.columns(2)
+    col1.button(
+        "⬅️ Newer",
+        key="leads_newer",
+        disabled=page == 1,
+        on_click=show_newer_leads,
+        use_container_width=True,
+    )
+    col2.button(
+        "Older ➡️",
+        key="leads_older",
+        disabled=not has_next_page,
+        on_click=show_older_leads,
+        args=((leads[-1]["created_at"], leads[-1]["id"]),) if leads else (),
+        use_container_width=True,
+    )
 
 # Footer
 st.markdown("---")
@@ -553,4 +613,5 @@ with col1:
     st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 with col2:
     if st.button("🔄 Refresh", key="manual_refresh"):
+        clear_lead_caches()
         st.rerun()
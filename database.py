@@ -1,13 +1,109 @@
+import json
+import logging
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from utils import json_dumps, json_loads, parse_json_list
+
+logger = logging.getLogger(__name__)
 
 DB_NAME = "pr_leads.db"
 
+# Per-connection tuning; journal_mode=WAL is persistent and set in init_database()
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=60000",
+)
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Open a database connection with performance pragmas applied"""
+    conn = sqlite3.connect(DB_NAME, check_same_thread=False)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# One connection per process, shared by the dashboard and the scheduler thread
+_shared_conn: Optional[sqlite3.Connection] = None
+_shared_conn_lock = threading.RLock()
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Yield the shared connection inside a transaction
+
+    Commits on success and rolls back on error, like ``with sqlite3.connect()``,
+    but reuses one connection instead of opening a new one per query.
+    """
+    global _shared_conn
+    with _shared_conn_lock:
+        if _shared_conn is None:
+            _shared_conn = _open_connection()
+            _detect_features(_shared_conn)
+        with _shared_conn:
+            yield _shared_conn
+
+
+def _can_execute(conn: sqlite3.Connection, sql: str) -> bool:
+    """Whether sql runs, i.e. the tables and SQLite modules it uses exist"""
+    try:
+        conn.execute(sql)
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _detect_features(conn: sqlite3.Connection):
+    """Set FTS_ENABLED / MATCH_TABLES_ENABLED from what the database provides
+
+    Runs when the shared connection is opened, so a process that never calls
+    init_database() still uses the indexes an earlier init created.
+    """
+    global FTS_ENABLED, MATCH_TABLES_ENABLED
+    FTS_ENABLED = _can_execute(conn, "SELECT rowid FROM leads_fts LIMIT 0")
+    MATCH_TABLES_ENABLED = _can_execute(conn, "SELECT json_valid('[]')") and all(
+        _can_execute(conn, f"SELECT 1 FROM {table} LIMIT 0") for _, table, _ in MATCH_TABLES
+    )
+
+
+def _features() -> Tuple[bool, bool]:
+    """(FTS_ENABLED, MATCH_TABLES_ENABLED), detected on first connection use"""
+    with _connect():
+        return FTS_ENABLED, MATCH_TABLES_ENABLED
+
+
+# Whether the leads_fts full-text index is available; set when the shared
+# connection opens and by init_database()
+FTS_ENABLED = False
+
+# Child tables mirroring the matched_* JSON columns: (column, table, value column)
+MATCH_TABLES = (
+    ("matched_categories", "lead_categories", "category"),
+    ("matched_roles", "lead_roles", "role"),
+    ("matched_keywords", "lead_keywords", "keyword"),
+)
+
+# Whether the MATCH_TABLES are available (needs SQLite JSON1); set when the
+# shared connection opens and by init_database()
+MATCH_TABLES_ENABLED = False
+
 
 def init_database():
     """Initialize database with required tables"""
-    conn = sqlite3.connect(DB_NAME)
+    global FTS_ENABLED, MATCH_TABLES_ENABLED
+
+    conn = _open_connection()
+    # WAL lets the dashboard read while the scraper writes
+    conn.execute("PRAGMA journal_mode=WAL")
     cursor = conn.cursor()
 
     cursor.execute(
@@ -29,7 +125,8 @@ def init_database():
             matched_roles TEXT,
             matched_categories TEXT,
             dismissed INTEGER DEFAULT 0,
-            raw_data TEXT
+            raw_data TEXT,
+            scraped_at_ts INTEGER
         )
     """
     )
@@ -60,6 +157,15 @@ def init_database():
     except sqlite3.OperationalError:
         pass
 
+    # Migration: Unix-seconds copy of scraped_at (local ISO time) for range queries
+    try:
+        cursor.execute("ALTER TABLE leads ADD COLUMN scraped_at_ts INTEGER")
+        cursor.execute(
+            "UPDATE leads SET scraped_at_ts = CAST(strftime('%s', scraped_at, 'utc') AS INTEGER)"
+        )
+    except sqlite3.OperationalError:
+        pass
+
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS activity_ids (
@@ -82,16 +188,30 @@ def init_database():
 
     cursor.execute(
         """
-        CREATE INDEX IF NOT EXISTS idx_platform ON leads(platform)
+        CREATE INDEX IF NOT EXISTS idx_leads_scraped_at_ts ON leads(scraped_at_ts)
     """
     )
 
+    # Migration: idx_leads_scraped_at_ts replaces the ISO-string index
+    cursor.execute("DROP INDEX IF EXISTS idx_scraped_at")
+
+    # Migration: Normalize legacy NULL dismissed flags so filters can use equality
+    cursor.execute("UPDATE leads SET dismissed = 0 WHERE dismissed IS NULL")
+
+    # Migration: Unknown post times are stored as '' so keyset paging can compare them
+    cursor.execute("UPDATE leads SET created_at = '' WHERE created_at IS NULL")
+
+    # Covers the dashboard listing: platform + not dismissed, newest posts first
     cursor.execute(
         """
-        CREATE INDEX IF NOT EXISTS idx_scraped_at ON leads(scraped_at)
+        CREATE INDEX IF NOT EXISTS idx_leads_platform_dismissed_created
+        ON leads(platform, dismissed, created_at DESC)
     """
     )
 
+    # Migration: platform is the leading column of the composite index above
+    cursor.execute("DROP INDEX IF EXISTS idx_platform")
+
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS processed_containers (
@@ -111,86 +231,253 @@ def init_database():
     """
     )
 
-    conn.commit()
-    conn.close()
+    # Raw PhantomBuster output per search, reused within a TTL (and as a
+    # fallback when launching the agent fails)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS search_output_cache (
+            agent_id TEXT NOT NULL,
+            search TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            payload TEXT NOT NULL,
+            PRIMARY KEY (agent_id, search)
+        ) WITHOUT ROWID
+    """
+    )
 
+    # GPT lead analyses by prompt-input hash, so a repeated post isn't billed twice
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gpt_analysis_cache (
+            input_hash TEXT PRIMARY KEY,
+            analyzed_at REAL NOT NULL,
+            analysis TEXT NOT NULL
+        ) WITHOUT ROWID
+    """
+    )
 
-def save_lead(platform: str, post_id: str, data: Dict) -> bool:
-    """Save a single lead to database"""
+    # Full-text index over post_content; the trigram tokenizer keeps the
+    # substring semantics of the old LIKE '%text%' search
     try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'leads_fts'"
+        )
+        fts_exists = cursor.fetchone() is not None
+
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5(
+                post_content, content='leads', content_rowid='id', tokenize='trigram'
+            )
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads BEGIN
+                INSERT INTO leads_fts(rowid, post_content) VALUES (new.id, new.post_content);
+            END
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads BEGIN
+                INSERT INTO leads_fts(leads_fts, rowid, post_content)
+                VALUES ('delete', old.id, old.post_content);
+            END
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE OF post_content ON leads BEGIN
+                INSERT INTO leads_fts(leads_fts, rowid, post_content)
+                VALUES ('delete', old.id, old.post_content);
+                INSERT INTO leads_fts(rowid, post_content) VALUES (new.id, new.post_content);
+            END
+        """
+        )
+
+        # Index rows that existed before the FTS table was created
+        if not fts_exists:
+            cursor.execute("INSERT INTO leads_fts(leads_fts) VALUES ('rebuild')")
+
+        FTS_ENABLED = True
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5/trigram: search falls back to LIKE
+        FTS_ENABLED = False
+
+    # Normalized matched_* values so category/role/keyword filters can use an
+    # index instead of LIKE scans over JSON text. Triggers keep them in sync
+    # with the JSON columns, so writers only ever set matched_*.
+    try:
+        cursor.execute("SELECT json_valid('[]')")
+
+        for column, table, value_column in MATCH_TABLES:
             cursor.execute(
-                """
-                INSERT OR IGNORE INTO leads
-                (platform, post_id, author_name, author_handle, author_username, author_title,
-                 company_name, post_content, post_url, budget_mention,
-                 created_at, scraped_at, matched_keywords, matched_roles,
-                 matched_categories, raw_data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    platform,
-                    post_id,
-                    data.get("author_name"),
-                    data.get("author_handle"),
-                    data.get("author_username"),
-                    data.get("author_title"),
-                    data.get("company_name"),
-                    data.get("post_content"),
-                    data.get("post_url"),
-                    data.get("budget_mention"),
-                    data.get("created_at"),
-                    datetime.now().isoformat(),
-                    data.get("matched_keywords"),
-                    data.get("matched_roles"),
-                    data.get("matched_categories"),
-                    data.get("raw_data"),
-                ),
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
             )
-            return cursor.rowcount > 0
-    except sqlite3.IntegrityError:
-        return False
+            table_exists = cursor.fetchone() is not None
 
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {value_column} TEXT NOT NULL,
+                    lead_id INTEGER NOT NULL,
+                    PRIMARY KEY ({value_column}, lead_id)
+                ) WITHOUT ROWID
+            """
+            )
 
-def save_activity_id(platform: str, activity_id: str, original_url: str = None) -> bool:
-    """Save an activity ID to track discovered posts
+            # Malformed JSON is treated as an empty list
+            values_sql = (
+                f"SELECT value, new.id FROM json_each("
+                f"CASE WHEN json_valid(new.{column}) THEN new.{column} ELSE '[]' END)"
+            )
+
+            cursor.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON leads BEGIN
+                    INSERT OR IGNORE INTO {table} ({value_column}, lead_id) {values_sql};
+                END
+            """
+            )
+
+            cursor.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {column} ON leads BEGIN
+                    DELETE FROM {table} WHERE lead_id = old.id;
+                    INSERT OR IGNORE INTO {table} ({value_column}, lead_id) {values_sql};
+                END
+            """
+            )
+
+            cursor.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON leads BEGIN
+                    DELETE FROM {table} WHERE lead_id = old.id;
+                END
+            """
+            )
+
+            # Migration: Backfill rows saved before the table existed
+            if not table_exists:
+                cursor.execute(
+                    f"""
+                    INSERT OR IGNORE INTO {table} ({value_column}, lead_id)
+                    SELECT j.value, leads.id
+                    FROM leads, json_each(
+                        CASE WHEN json_valid(leads.{column}) THEN leads.{column} ELSE '[]' END
+                    ) AS j
+                """
+                )
+
+        MATCH_TABLES_ENABLED = True
+    except sqlite3.OperationalError:
+        # SQLite built without JSON1: filters fall back to LIKE on the JSON text
+        MATCH_TABLES_ENABLED = False
+
+    # Gather planner statistics once so SQLite picks the new indexes
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    )
+    if cursor.fetchone() is None:
+        cursor.execute("ANALYZE")
+
+    conn.commit()
+    conn.close()
+
+
+_INSERT_LEAD_SQL = """
+    INSERT OR IGNORE INTO leads
+    (platform, post_id, author_name, author_handle, author_username, author_title,
+     company_name, post_content, post_url, budget_mention,
+     created_at, scraped_at, matched_keywords, matched_roles,
+     matched_categories, raw_data, scraped_at_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _lead_rows(platform: str, leads: List[Tuple[str, Dict]]) -> List[tuple]:
+    """Build _INSERT_LEAD_SQL parameter rows from (post_id, data) tuples"""
+    now = datetime.now()
+    scraped_at = now.isoformat()
+    scraped_at_ts = int(now.timestamp())
+    return [
+        (
+            platform,
+            post_id,
+            data.get("author_name"),
+            data.get("author_handle"),
+            data.get("author_username"),
+            data.get("author_title"),
+            data.get("company_name"),
+            data.get("post_content"),
+            data.get("post_url"),
+            data.get("budget_mention"),
+            data.get("created_at") or "",
+            scraped_at,
+            data.get("matched_keywords"),
+            data.get("matched_roles"),
+            data.get("matched_categories"),
+            data.get("raw_data"),
+            scraped_at_ts,
+        )
+        for post_id, data in leads
+    ]
+
+
+def save_scraped_posts(
+    platform: str, posts: List[Tuple[str, Optional[str], Optional[Dict]]]
+) -> int:
+    """Record scraped posts and save the leads among them in one transaction
+
+    Each post is marked as scraped in activity_ids and, if it has lead data,
+    inserted into leads. Either everything is written or nothing is, so a
+    failed or interrupted run leaves its posts to be picked up again.
 
     Args:
         platform: Platform name (e.g., "linkedin")
-        activity_id: Unique activity identifier
-        original_url: Original URL of the post (optional but recommended)
+        posts: List of (activity_id, original_url, lead data or None) tuples
 
     Returns:
-        True if new activity ID was inserted, False if already exists
+        Number of leads actually inserted (duplicates are ignored)
     """
-    try:
-        with sqlite3.connect(DB_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO activity_ids (platform, activity_id, original_url, discovered_at)
-                VALUES (?, ?, ?, ?)
-            """,
-                (platform, activity_id, original_url, datetime.now().isoformat()),
-            )
-            return cursor.rowcount > 0
-    except sqlite3.IntegrityError:
-        return False
+    if not posts:
+        return 0
 
+    discovered_at = datetime.now().isoformat()
+    leads = [(activity_id, data) for activity_id, _, data in posts if data is not None]
 
-def mark_activity_scraped(platform: str, activity_id: str):
-    """Mark an activity ID as scraped"""
-    with sqlite3.connect(DB_NAME) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
-        cursor.execute(
+        cursor.executemany(
             """
-            UPDATE activity_ids
-            SET scraped = 1
-            WHERE platform = ? AND activity_id = ?
+            INSERT INTO activity_ids (platform, activity_id, original_url, discovered_at, scraped)
+            VALUES (?, ?, ?, ?, 1)
+            ON CONFLICT (platform, activity_id) DO UPDATE SET scraped = 1
         """,
-            (platform, activity_id),
+            [
+                (platform, activity_id, original_url, discovered_at)
+                for activity_id, original_url, _ in posts
+            ],
         )
+        if not leads:
+            return 0
+        cursor.executemany(_INSERT_LEAD_SQL, _lead_rows(platform, leads))
+        return cursor.rowcount
+
+
+def get_activity_ids(platform: str) -> Set[str]:
+    """Get every activity ID already discovered for a platform"""
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT activity_id FROM activity_ids WHERE platform = ?", (platform,)
+        )
+        return {row[0] for row in cursor}
 
 
 def get_unscraped_activity_ids(platform: str) -> List[tuple]:
@@ -203,7 +490,7 @@ def get_unscraped_activity_ids(platform: str) -> List[tuple]:
         List of (activity_id, original_url) tuples.
         If original_url is None, caller should reconstruct the URL.
     """
-    with sqlite3.connect(DB_NAME) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -217,7 +504,7 @@ def get_unscraped_activity_ids(platform: str) -> List[tuple]:
 
 def get_lead_count(platform: Optional[str] = None) -> int:
     """Get total number of leads, optionally filtered by platform"""
-    with sqlite3.connect(DB_NAME) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
 
         if platform:
@@ -230,16 +517,16 @@ def get_lead_count(platform: Optional[str] = None) -> int:
 
 def get_recent_leads(platform: Optional[str] = None, limit: int = 10) -> List[Dict]:
     """Get most recent leads"""
-    with sqlite3.connect(DB_NAME) as conn:
-        conn.row_factory = sqlite3.Row
+    with _connect() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
 
         if platform:
             cursor.execute(
                 """
                 SELECT * FROM leads
                 WHERE platform = ?
-                ORDER BY scraped_at DESC
+                ORDER BY scraped_at_ts DESC
                 LIMIT ?
             """,
                 (platform, limit),
@@ -248,7 +535,7 @@ def get_recent_leads(platform: Optional[str] = None, limit: int = 10) -> List[Di
             cursor.execute(
                 """
                 SELECT * FROM leads
-                ORDER BY scraped_at DESC
+                ORDER BY scraped_at_ts DESC
                 LIMIT ?
             """,
                 (limit,),
@@ -258,6 +545,96 @@ def get_recent_leads(platform: Optional[str] = None, limit: int = 10) -> List[Di
         return [dict(row) for row in rows]
 
 
+@lru_cache(maxsize=None)
+def _leads_filtered_sql(
+    platform: bool,
+    exclude_dismissed: bool,
+    category: bool,
+    role: bool,
+    keyword: bool,
+    search_mode: Optional[str],
+    date_range: bool,
+    after: bool,
+    paged: bool,
+    match_tables: bool,
+) -> str:
+    """Build the get_leads_filtered SQL for one combination of active filters
+
+    Cached so each combination's text is built once; identical text also keeps
+    hitting sqlite3's per-connection prepared statement cache.
+
+    Args:
+        search_mode: "fts", "like", or None when there is no search text
+        after: Only rows past a (created_at, id) keyset position
+        match_tables: Filter category/role/keyword through the MATCH_TABLES
+                      (exact value) instead of LIKE on the JSON columns; also
+                      means JSON1 is available for the budget fallback
+    """
+    # Only the columns the lead list renders; raw_data can be large, so with
+    # JSON1 just its first budget mention is extracted, otherwise
+    # get_leads_filtered() reads it from raw_data in Python.
+    if match_tables:
+        budget = """COALESCE(
+                NULLIF(budget_mention, ''),
+                CASE WHEN json_valid(raw_data)
+                    THEN json_extract(raw_data, '$.budget_mentions[0]') END
+            ) AS budget_mention"""
+    else:
+        budget = "budget_mention, raw_data"
+
+    # age_seconds: seconds since the post (or scrape, if the post time is
+    # unknown) computed by SQLite so the dashboard doesn't parse timestamps.
+    # created_at carries a UTC offset; scraped_at is naive local time.
+    query = f"""
+        SELECT id, author_name, author_username, post_content, post_url,
+            created_at, matched_keywords, matched_roles, matched_categories,
+            {budget},
+            CAST(
+                (julianday('now') - CASE
+                    WHEN created_at <> '' THEN julianday(created_at)
+                    ELSE julianday(scraped_at, 'utc')
+                END) * 86400 AS INTEGER
+            ) AS age_seconds
+        FROM leads WHERE 1=1"""
+
+    if platform:
+        query += " AND platform = ?"
+
+    if exclude_dismissed:
+        query += " AND dismissed = 0"
+
+    for active, (column, table, value_column) in zip((category, role, keyword), MATCH_TABLES):
+        if not active:
+            continue
+        if match_tables:
+            query += (
+                f" AND EXISTS (SELECT 1 FROM {table}"
+                f" WHERE {value_column} = ? AND lead_id = leads.id)"
+            )
+        else:
+            query += f" AND ({column} LIKE ? OR {column} LIKE ?)"
+
+    if search_mode == "fts":
+        query += " AND id IN (SELECT rowid FROM leads_fts WHERE leads_fts MATCH ?)"
+    elif search_mode == "like":
+        query += " AND post_content LIKE ?"
+
+    if date_range:
+        query += " AND created_at >= ?"
+
+    # Keyset position in the ORDER BY below; ties on created_at go by id
+    # ascending, which is the order idx_leads_platform_dismissed_created stores
+    if after:
+        query += " AND created_at <= ? AND (created_at < ? OR id > ?)"
+
+    query += " ORDER BY created_at DESC, id"
+
+    if paged:
+        query += " LIMIT ?"
+
+    return query
+
+
 def get_leads_filtered(
     platform: Optional[str] = None,
     category: Optional[str] = None,
@@ -267,94 +644,147 @@ def get_leads_filtered(
     include_dismissed: bool = False,
     date_range_hours: Optional[int] = None,
     limit: Optional[int] = None,
+    after: Optional[Tuple[str, int]] = None,
 ) -> List[Dict]:
     """Get leads with advanced filtering
 
     Args:
         date_range_hours: If specified, only return leads where created_at (post timestamp)
                          is within this many hours from now
-    """
-    with sqlite3.connect(DB_NAME) as conn:
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM leads WHERE 1=1"
-        params = []
-
-        if platform:
-            query += " AND platform = ?"
-            params.append(platform)
-
-        if not include_dismissed:
-            query += " AND (dismissed = 0 OR dismissed IS NULL)"
+        limit: Page size (no limit if None)
+        after: (created_at, id) of the last lead on the previous page; only
+               leads listed after it are returned (keyset paging, no OFFSET scan)
 
-        if category:
-            query += " AND matched_categories LIKE ?"
-            params.append(f'%"{category}"%')
+    Returns:
+        Lead dicts with the columns the dashboard lists (no raw_data):
+        matched_keywords/matched_roles/matched_categories decoded to lists,
+        budget_mention falling back to raw_data's first budget_mentions entry,
+        and age_seconds since the post
+    """
+    fts_enabled, match_tables_enabled = _features()
 
-        if role:
-            query += " AND matched_roles LIKE ?"
-            params.append(f'%"{role}"%')
+    # Parameters must be appended in the same order as _leads_filtered_sql adds clauses
+    params = []
 
-        if keyword:
-            query += " AND matched_keywords LIKE ?"
-            params.append(f'%"{keyword}"%')
+    if platform:
+        params.append(platform)
 
-        if search_text:
-            query += " AND post_content LIKE ?"
+    for value in (category, role, keyword):
+        if not value:
+            continue
+        if match_tables_enabled:
+            params.append(value)
+        else:
+            # The JSON columns hold non-ASCII as raw UTF-8 when written through
+            # orjson and as \uXXXX escapes when written by json.dumps; match both
+            params.append(f"%{json.dumps(value, ensure_ascii=False)}%")
+            params.append(f"%{json.dumps(value)}%")
+
+    search_mode = None
+    if search_text:
+        # Trigram FTS can't match terms shorter than 3 characters
+        if fts_enabled and len(search_text) >= 3:
+            search_mode = "fts"
+            params.append('"' + search_text.replace('"', '""') + '"')
+        else:
+            search_mode = "like"
             params.append(f"%{search_text}%")
 
-        if date_range_hours:
-            from datetime import timedelta
-
-            cutoff_time = (datetime.now() - timedelta(hours=date_range_hours)).isoformat()
-            query += " AND created_at >= ?"
-            params.append(cutoff_time)
-
-        query += " ORDER BY created_at DESC"
-
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
+    if date_range_hours:
+        from datetime import timedelta
+
+        cutoff_time = (datetime.now() - timedelta(hours=date_range_hours)).isoformat()
+        params.append(cutoff_time)
+
+    if after:
+        after_created_at, after_id = after
+        params.extend([after_created_at, after_created_at, after_id])
+
+    if limit:
+        params.append(limit)
+
+    query = _leads_filtered_sql(
+        platform=bool(platform),
+        exclude_dismissed=not include_dismissed,
+        category=bool(category),
+        role=bool(role),
+        keyword=bool(keyword),
+        search_mode=search_mode,
+        date_range=bool(date_range_hours),
+        after=bool(after),
+        paged=bool(limit),
+        match_tables=match_tables_enabled,
+    )
 
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
         cursor.execute(query, params)
         rows = cursor.fetchall()
-        return [dict(row) for row in rows]
 
+    leads = []
+    for row in rows:
+        lead = dict(row)
+        for column, _, _ in MATCH_TABLES:
+            lead[column] = list(parse_json_list(lead[column]))
+        if "raw_data" in lead:
+            raw_data = lead.pop("raw_data")
+            if not lead["budget_mention"] and raw_data:
+                try:
+                    budget_mentions = json_loads(raw_data).get("budget_mentions")
+                except (ValueError, AttributeError):
+                    budget_mentions = None
+                lead["budget_mention"] = budget_mentions[0] if budget_mentions else None
+        leads.append(lead)
+    return leads
+
+
+def dismiss_leads(lead_ids: List[int]) -> int:
+    """Mark several leads as dismissed in a single transaction
+
+    Args:
+        lead_ids: IDs of leads to dismiss
+
+    Returns:
+        Number of leads updated
+    """
+    if not lead_ids:
+        return 0
 
-def dismiss_lead(lead_id: int) -> bool:
-    """Mark a lead as dismissed"""
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with _connect() as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 """
                 UPDATE leads
                 SET dismissed = 1
                 WHERE id = ?
             """,
-                (lead_id,),
+                [(lead_id,) for lead_id in lead_ids],
             )
-            return cursor.rowcount > 0
+            return cursor.rowcount
     except sqlite3.Error as e:
-        print(f"Error dismissing lead {lead_id}: {e}")
-        return False
+        logger.error(f"Error dismissing leads {lead_ids}: {e}")
+        return 0
 
 
 def get_leads_today_count() -> int:
     """Get count of leads scraped today"""
-    from datetime import datetime, timedelta
+    from datetime import timedelta
 
-    today = datetime.now().date()
-    with sqlite3.connect(DB_NAME) as conn:
+    # Local midnight to midnight as Unix seconds, a range on idx_leads_scraped_at_ts
+    midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+    start_ts = int(midnight.timestamp())
+    end_ts = int((midnight + timedelta(days=1)).timestamp())
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
             SELECT COUNT(*) FROM leads
-            WHERE DATE(scraped_at) = DATE(?)
-            AND (dismissed = 0 OR dismissed IS NULL)
+            WHERE scraped_at_ts >= ? AND scraped_at_ts < ?
+            AND dismissed = 0
         """,
-            (today.isoformat(),),
+            (start_ts, end_ts),
         )
         return cursor.fetchone()[0]
 
@@ -364,7 +794,7 @@ def save_processed_container(
 ) -> bool:
     """Save a processed container to track what we've already processed"""
     try:
-        with sqlite3.connect(DB_NAME) as conn:
+        with _connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -381,7 +811,7 @@ def save_processed_container(
 
 def is_container_processed(container_id: str) -> bool:
     """Check if a container has already been processed"""
-    with sqlite3.connect(DB_NAME) as conn:
+    with _connect() as conn:
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -395,9 +825,9 @@ def is_container_processed(container_id: str) -> bool:
 
 def get_processed_containers(agent_id: Optional[str] = None) -> List[Dict]:
     """Get list of processed containers, optionally filtered by agent_id"""
-    with sqlite3.connect(DB_NAME) as conn:
-        conn.row_factory = sqlite3.Row
+    with _connect() as conn:
         cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
 
         if agent_id:
             cursor.execute(
@@ -418,3 +848,87 @@ def get_processed_containers(agent_id: Optional[str] = None) -> List[Dict]:
 
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
+
+
+def save_search_output(agent_id: str, search: str, output: List[Dict]):
+    """Cache the raw agent output for a search, replacing any older copy"""
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO search_output_cache (agent_id, search, fetched_at, payload)
+            VALUES (?, ?, ?, ?)
+        """,
+            (agent_id, search, time.time(), json_dumps(output)),
+        )
+
+
+def get_search_output(
+    agent_id: str, search: str, max_age_seconds: Optional[float] = None
+) -> Optional[List[Dict]]:
+    """Get the cached raw agent output for a search
+
+    Args:
+        agent_id: PhantomBuster agent ID
+        search: Search keyword/URL the agent was launched with
+        max_age_seconds: Ignore entries older than this (any age if None)
+
+    Returns:
+        The cached output list, or None on a miss
+    """
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT fetched_at, payload FROM search_output_cache
+            WHERE agent_id = ? AND search = ?
+        """,
+            (agent_id, search),
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    fetched_at, payload = row
+    if max_age_seconds is not None and time.time() - fetched_at > max_age_seconds:
+        return None
+    return json_loads(payload)
+
+
+def save_gpt_analysis(input_hash: str, analysis: Dict):
+    """Cache a GPT lead analysis, replacing any older copy"""
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO gpt_analysis_cache (input_hash, analyzed_at, analysis)
+            VALUES (?, ?, ?)
+        """,
+            (input_hash, time.time(), json_dumps(analysis)),
+        )
+
+
+def get_gpt_analysis(
+    input_hash: str, max_age_seconds: Optional[float] = None
+) -> Optional[Dict]:
+    """Get a cached GPT lead analysis
+
+    Args:
+        input_hash: Hash of the model and prompt inputs
+        max_age_seconds: Ignore entries older than this (any age if None)
+
+    Returns:
+        The cached analysis dict, or None on a miss
+    """
+    with _connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT analyzed_at, analysis FROM gpt_analysis_cache WHERE input_hash = ?",
+            (input_hash,),
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    analyzed_at, analysis = row
+    if max_age_seconds is not None and time.time() - analyzed_at > max_age_seconds:
+        return None
+    return json_loads(analysis)
@@ -1,10 +1,12 @@
-import json
+import copy
+import os
 import time
 import logging
-import schedule
+import threading
 from typing import Callable, Optional
 from scraper_twitter import main as run_twitter_scraper
 from database import init_database
+from utils import json_dumps, json_loads
 
 # Setup logging
 logging.basicConfig(
@@ -16,29 +18,51 @@ logger = logging.getLogger(__name__)
 class ScraperMonitor:
     """Manages scheduled scraping and monitoring state"""
 
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(
+        self,
+        config_path: str = "config.json",
+        scraper_fn: Callable[[], None] = run_twitter_scraper,
+    ):
         self.config_path = config_path
+        # Scraper entry point run by each job (Twitter by default)
+        self.scraper_fn = scraper_fn
         self.is_running = False
         self.last_run_status = "Not started"
         self.last_run_time = None
         self.next_run_time = None
+        # Parsed config.json, reused until the file's mtime changes
+        self._config: Optional[dict] = None
+        self._config_mtime: Optional[int] = None
+        # Background scheduler; each thread gets its own stop event so a
+        # quick stop/start can't leave two loops running
+        self._scheduler_lock = threading.Lock()
+        self._scheduler_stop: Optional[threading.Event] = None
+
+    def _read_config(self) -> dict:
+        """Parsed config, re-read only when the file changed (do not mutate)"""
+        mtime = os.stat(self.config_path).st_mtime_ns
+        if self._config is None or mtime != self._config_mtime:
+            with open(self.config_path, "rb") as f:
+                self._config = json_loads(f.read())
+            self._config_mtime = mtime
+        return self._config
 
     def load_config(self) -> dict:
         """Load configuration from JSON file"""
-        with open(self.config_path, "r") as f:
-            return json.load(f)
+        return copy.deepcopy(self._read_config())
 
     def save_config(self, config: dict):
         """Save configuration to JSON file"""
-        with open(self.config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write(json_dumps(config, indent=True))
+        self._config = None
 
     def get_monitoring_status(self) -> dict:
         """Get current monitoring state"""
-        config = self.load_config()
+        monitoring = self._read_config().get("monitoring", {})
         return {
-            "active": config.get("monitoring", {}).get("active", False),
-            "interval_hours": config.get("monitoring", {}).get("interval_hours", 1),
+            "active": monitoring.get("active", False),
+            "interval_hours": monitoring.get("interval_hours", 1),
             "is_running": self.is_running,
             "last_run_status": self.last_run_status,
             "last_run_time": self.last_run_time,
@@ -67,7 +91,7 @@ class ScraperMonitor:
 
     def run_scraper_job(self):
         """Execute the scraper (scheduled job)"""
-        config = self.load_config()
+        config = self._read_config()
 
         # Check if monitoring is still active
         if not config.get("monitoring", {}).get("active", False):
@@ -82,7 +106,7 @@ class ScraperMonitor:
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
             logger.info(f"🔄 Running scheduled scrape at {timestamp}")
             print(f"\n🔄 Running scheduled scrape at {timestamp}")
-            run_twitter_scraper()
+            self.scraper_fn()
             self.last_run_status = "success"
             logger.info("✅ Scheduled scrape completed successfully")
             print("✅ Scheduled scrape completed successfully")
@@ -104,18 +128,49 @@ class ScraperMonitor:
         print("\n🚀 Manual scrape triggered")
         self.run_scraper_job()
 
+    def start_background_scheduler(self, interval_hours: int = 1):
+        """Run the scraper every interval_hours in a daemon thread"""
+        with self._scheduler_lock:
+            if self._scheduler_stop is not None:
+                return  # Already running
+
+            stop_event = threading.Event()
+            self._scheduler_stop = stop_event
+
+            # Calculate initial next run time
+            self.next_run_time = time.time() + (interval_hours * 3600)
+
+        threading.Thread(
+            target=self._run_scheduler_loop,
+            args=(stop_event, interval_hours * 3600),
+            daemon=True,
+        ).start()
+
+    def stop_background_scheduler(self):
+        """Stop the background scheduler, waking its thread immediately"""
+        with self._scheduler_lock:
+            stop_event = self._scheduler_stop
+            self._scheduler_stop = None
+
+        if stop_event is not None:
+            stop_event.set()
+
+    def _run_scheduler_loop(self, stop_event: threading.Event, interval_seconds: float):
+        """Background thread: sleep until the next monotonic deadline or until stopped"""
+        next_run = time.monotonic() + interval_seconds
+        # wait() returns True as soon as the stop event is set
+        while not stop_event.wait(timeout=max(next_run - time.monotonic(), 0)):
+            self.run_scraper_job()
+            next_run = time.monotonic() + interval_seconds
+            self.next_run_time = time.time() + interval_seconds
+
 
 def start_scheduler(monitor: ScraperMonitor, interval_hours: int = 1):
-    """Start the background scheduler"""
+    """Run the scheduler loop in the foreground (blocks until interrupted)"""
     print(f"⏰ Scheduler started: running every {interval_hours} hour(s)")
 
-    # Schedule the job
-    schedule.every(interval_hours).hours.do(monitor.run_scraper_job)
-
-    # Run scheduler loop
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+    monitor.next_run_time = time.time() + (interval_hours * 3600)
+    monitor._run_scheduler_loop(threading.Event(), interval_hours * 3600)
 
 
 if __name__ == "__main__":
@@ -4,11 +4,20 @@ PhantomBuster API client for LinkedIn content search automation
 Handles agent launches, status polling, and output retrieval.
 """
 
+import heapq
 import os
+import logging
+import random
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, Any, List
 
+from utils import json_loads
+
+logger = logging.getLogger(__name__)
+
 
 class PhantomBusterClient:
     """Client for interacting with PhantomBuster API v1"""
@@ -29,6 +38,28 @@ class PhantomBusterClient:
         self.session = requests.Session()
         self.session.headers.update({"X-Phantombuster-Key-1": self.api_key})
 
+        # Separate keep-alive session for S3 result downloads so the API key
+        # header is never sent to S3
+        self._s3_session = requests.Session()
+
+        # Retry transient 429/5xx with backoff (honouring Retry-After) inside
+        # the transport. GET only: retrying the launch POST could start a
+        # second agent run. raise_on_status=False hands the last response
+        # back so raise_for_status() reports it as usual.
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        for session in (self.session, self._s3_session):
+            session.mount(
+                "https://",
+                HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=32),
+            )
+
     def launch_agent(
         self,
         agent_id: str,
@@ -110,6 +141,17 @@ class PhantomBusterClient:
         response.raise_for_status()
         raise Exception(f"Unexpected response from PhantomBuster: {response.text}")
 
+    def _list_containers(self, agent_id: str) -> List[Dict[str, Any]]:
+        """Fetch every container of an agent in one request"""
+        endpoint = f"{self.BASE_URL}/agent/{agent_id}/containers"
+        response = self.session.get(endpoint)
+        response.raise_for_status()
+
+        data = response.json()
+
+        # PhantomBuster returns: {"status": "success", "data": [containers...]}
+        return data.get("data", [])
+
     def get_agent_status(self, agent_id: str, container_id: str) -> Dict[str, Any]:
         """
         Get status of a running agent container
@@ -121,14 +163,7 @@ class PhantomBusterClient:
         Returns:
             Status dict with keys: lastEndStatus, exitCode, etc.
         """
-        endpoint = f"{self.BASE_URL}/agent/{agent_id}/containers"
-        response = self.session.get(endpoint)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # PhantomBuster returns: {"status": "success", "data": [containers...]}
-        containers = data.get("data", [])
+        containers = self._list_containers(agent_id)
 
         # Try both string and int comparison since API might return either format
         for container in containers:
@@ -143,68 +178,69 @@ class PhantomBusterClient:
             f"Found {len(containers)} containers. Recent IDs: {container_ids}"
         )
 
-    def wait_for_completion(
+    def wait_for_many(
         self,
         agent_id: str,
-        container_id: str,
+        container_ids: List[str],
         poll_interval: int = 30,
         timeout: int = 380,
-    ) -> Dict[str, Any]:
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        Poll agent status until completion or timeout
+        Poll several containers of one agent until all have finished
+
+        The containers endpoint lists every container of the agent, so each
+        polling cycle is a single request however many containers are pending.
+        Polling starts every 2s and backs off towards poll_interval, so short
+        runs are noticed quickly without extra requests on long ones.
 
         Args:
             agent_id: PhantomBuster agent ID
-            container_id: Container ID from launch_agent()
-            poll_interval: Seconds between status checks (default 30)
+            container_ids: Container IDs from launch_agent()
+            poll_interval: Max seconds between status checks (default 30)
             timeout: Max seconds to wait (default 380 = 6.3 minutes)
 
         Returns:
-            Final status dict
+            Dict of container ID (str) -> final container dict. Failed
+            containers are included; check their lastEndStatus.
 
         Raises:
-            TimeoutError: If agent doesn't complete within timeout
-            Exception: If agent fails
+            TimeoutError: If any container doesn't finish within timeout
         """
+        pending = {str(container_id) for container_id in container_ids}
+        finished = {}
+        last_pending_count = None
         start_time = time.time()
+        delay = 2
 
-        # Initial delay to let container appear in API (race condition fix)
+        # Initial delay to let containers appear in API (race condition fix)
         time.sleep(2)
 
         while True:
-            elapsed = time.time() - start_time
-            if elapsed > timeout:
+            # Containers that don't appear yet simply stay pending
+            for container in self._list_containers(agent_id):
+                cid = str(container.get("id"))
+                # Container status fields: lastEndStatus (success/error), endDate (timestamp when done)
+                if cid in pending and container.get("endDate"):
+                    pending.discard(cid)
+                    finished[cid] = container
+                    logger.info(f"Container {cid} finished ({container.get('lastEndStatus')})")
+
+            if not pending:
+                return finished
+
+            if time.time() - start_time > timeout:
                 raise TimeoutError(
-                    f"Agent {agent_id} did not complete within {timeout}s"
+                    f"Agent {agent_id} containers {sorted(pending)} did not complete within {timeout}s"
                 )
 
-            try:
-                container = self.get_agent_status(agent_id, container_id)
-            except Exception as e:
-                # If container not found yet, wait and retry
-                if "not found" in str(e):
-                    print(f"    Container not found yet, retrying in 5s...")
-                    time.sleep(5)
-                    continue
-                raise
-
-            # Container status fields: lastEndStatus (success/error), endDate (timestamp when done)
-            last_status = container.get("lastEndStatus")
-            end_date = container.get("endDate")
-
-            if end_date:
-                # Container has finished
-                print(f"    Status: finished ({last_status})")
-                if last_status == "success":
-                    return container
-                else:
-                    error_msg = container.get("exitMessage", last_status or "Unknown error")
-                    raise Exception(f"Agent {agent_id} failed: {error_msg}")
-            else:
-                # Still running
-                print(f"    Status: running...")
+            if len(pending) != last_pending_count:
+                # Only log when a container finishes, not on every poll
+                logger.debug(f"{len(pending)} container(s) still running")
+                last_pending_count = len(pending)
 
-            time.sleep(poll_interval)
+            # Exponential backoff with a little jitter, capped at poll_interval
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+            delay = min(poll_interval, delay * 1.5)
 
     def fetch_output(self, agent_id: str, container_id: str) -> List[Dict[str, Any]]:
         """
@@ -223,51 +259,8 @@ class PhantomBusterClient:
         Raises:
             ValueError: If response format is unexpected or no results found
         """
-        # Get result object which contains S3 URLs
-        endpoint = "https://api.phantombuster.com/api/v2/containers/fetch-result-object"
-
-        print(f"    Fetching result object (container: {container_id})...")
-
-        response = self.session.get(endpoint, params={"id": container_id})
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Response format: {"resultObject": '{"csvURL":"...","jsonUrl":"..."}'}
-        if not isinstance(data, dict) or "resultObject" not in data:
-            raise ValueError(f"No resultObject in response: {data}")
-
-        result_obj = data["resultObject"]
-
-        if not result_obj:
-            print(f"    Warning: resultObject is null (no data scraped)")
-            return []
-
-        # Parse the result object JSON string
-        import json as json_module
-        if isinstance(result_obj, str):
-            result_obj = json_module.loads(result_obj)
-
-        # Extract JSON URL from result object
-        if not isinstance(result_obj, dict) or "jsonUrl" not in result_obj:
-            raise ValueError(f"No jsonUrl in resultObject: {result_obj}")
-
-        json_url = result_obj["jsonUrl"]
-        print(f"    Fetching scraped data from S3...")
-
-        # Fetch the actual scraped LinkedIn posts from S3
-        s3_response = requests.get(json_url)
-        s3_response.raise_for_status()
-
-        posts = s3_response.json()
-
-        if isinstance(posts, list):
-            return posts
-        else:
-            raise ValueError(
-                f"Unexpected S3 data format: {type(posts).__name__}. "
-                f"Expected list, got: {str(posts)[:200]}"
-            )
+        # The result object is looked up by container ID alone
+        return self.fetch_output_by_container_id(container_id)
 
     def get_all_containers(self, agent_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -281,20 +274,15 @@ class PhantomBusterClient:
             List of container dicts with keys: id, lastEndStatus, endDate, etc.
             Sorted by most recent first
         """
-        endpoint = f"{self.BASE_URL}/agent/{agent_id}/containers"
-        response = self.session.get(endpoint)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # PhantomBuster returns: {"status": "success", "data": [containers...]}
-        containers = data.get("data", [])
-
-        # Sort by most recent first (containers with endDate)
-        containers_with_date = [c for c in containers if c.get("endDate")]
-        containers_with_date.sort(key=lambda c: c.get("endDate", ""), reverse=True)
-
-        return containers_with_date[:limit]
+        containers = self._list_containers(agent_id)
+
+        # Most recent first (containers with endDate); a top-K selection
+        # instead of sorting the agent's whole history
+        return heapq.nlargest(
+            limit,
+            (c for c in containers if c.get("endDate")),
+            key=lambda c: c["endDate"],
+        )
 
     def fetch_output_by_container_id(self, container_id: str) -> List[Dict[str, Any]]:
         """
@@ -314,7 +302,7 @@ class PhantomBusterClient:
         # Get result object which contains S3 URLs
         endpoint = "https://api.phantombuster.com/api/v2/containers/fetch-result-object"
 
-        print(f"    Fetching result object (container: {container_id})...")
+        logger.debug(f"Fetching result object (container: {container_id})")
 
         response = self.session.get(endpoint, params={"id": container_id})
         response.raise_for_status()
@@ -328,27 +316,26 @@ class PhantomBusterClient:
         result_obj = data["resultObject"]
 
         if not result_obj:
-            print(f"    Warning: resultObject is null (no data scraped)")
+            logger.warning(f"resultObject is null for container {container_id} (no data scraped)")
             return []
 
         # Parse the result object JSON string
-        import json as json_module
-
         if isinstance(result_obj, str):
-            result_obj = json_module.loads(result_obj)
+            result_obj = json_loads(result_obj)
 
         # Extract JSON URL from result object
         if not isinstance(result_obj, dict) or "jsonUrl" not in result_obj:
             raise ValueError(f"No jsonUrl in resultObject: {result_obj}")
 
         json_url = result_obj["jsonUrl"]
-        print(f"    Fetching scraped data from S3...")
+        logger.debug(f"Fetching scraped data from S3 (container: {container_id})")
 
         # Fetch the actual scraped LinkedIn posts from S3
-        s3_response = requests.get(json_url)
+        s3_response = self._s3_session.get(json_url, timeout=30)
         s3_response.raise_for_status()
 
-        posts = s3_response.json()
+        # Decode straight from the response bytes (orjson when available)
+        posts = json_loads(s3_response.content)
 
         if isinstance(posts, list):
             return posts
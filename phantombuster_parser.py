@@ -5,9 +5,27 @@ Normalizes PhantomBuster data to our internal post format.
 """
 
 import re
-from typing import Dict, Any, List, Optional
-
-
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set
+
+# Activity ID in any LinkedIn URL format: /posts/foo-activity-7123,
+# activity:7123 and urn:li:activity:7123 (the last is a case of the second)
+_ACTIVITY_ID_RE = re.compile(r"activity[:-](\d+)")
+
+# Normalized field -> PhantomBuster field names to try in order, and default
+_FIELD_ALIASES = (
+    ("text", ("postContent", "text", "content", "description"), ""),
+    ("post_url", ("postUrl", "url"), ""),
+    ("author_name", ("profileName", "authorName", "name"), ""),
+    ("author_profile_url", ("profileUrl", "authorUrl", "profile"), ""),
+    ("timestamp", ("timestamp", "date"), ""),  # Optional fields from here on
+    ("likes", ("likes", "likeCount"), 0),
+    ("comments", ("comments", "commentCount"), 0),
+)
+
+
+# Pure, and hit twice per post when parse_phantombuster_output pre-checks IDs
+@lru_cache(maxsize=4096)
 def extract_activity_id_from_url(url: str) -> Optional[str]:
     """
     Extract LinkedIn activity ID from post URL
@@ -27,18 +45,8 @@ def extract_activity_id_from_url(url: str) -> Optional[str]:
     if not url:
         return None
 
-    # Match activity ID from various LinkedIn URL formats
-    patterns = [
-        r"activity[:-](\d+)",  # /posts/foo-activity-7123 or activity:7123
-        r"urn:li:activity:(\d+)",  # urn:li:activity:7123
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-
-    return None
+    match = _ACTIVITY_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
 def normalize_post_data(pb_post: Dict[str, Any]) -> Dict[str, Any]:
@@ -70,65 +78,39 @@ def normalize_post_data(pb_post: Dict[str, Any]) -> Dict[str, Any]:
         >>> result["activity_id"]
         '7123'
     """
-    # PhantomBuster field names may vary; try common variations
-    text = (
-        pb_post.get("postContent")
-        or pb_post.get("text")
-        or pb_post.get("content")
-        or pb_post.get("description")
-        or ""
+    get = pb_post.get
+    normalized = {}
+
+    # PhantomBuster field names may vary; take the first non-empty variation
+    for field, source_keys, default in _FIELD_ALIASES:
+        for key in source_keys:
+            value = get(key)
+            if value:
+                break
+        else:
+            value = default
+        normalized[field] = value
+
+    # Extract activity ID from URL, falling back to query if not found in URL
+    normalized["activity_id"] = (
+        extract_activity_id_from_url(normalized["post_url"]) or get("query", "")
     )
+    normalized["source"] = "phantombuster"
 
-    post_url = pb_post.get("postUrl") or pb_post.get("url") or ""
-
-    # Extract activity ID from URL
-    activity_id = extract_activity_id_from_url(post_url)
-
-    # Fallback: use query if activity_id not found in URL
-    if not activity_id:
-        activity_id = pb_post.get("query", "")
-
-    author_name = (
-        pb_post.get("profileName")
-        or pb_post.get("authorName")
-        or pb_post.get("name")
-        or ""
-    )
-
-    author_profile_url = (
-        pb_post.get("profileUrl")
-        or pb_post.get("authorUrl")
-        or pb_post.get("profile")
-        or ""
-    )
-
-    # Optional fields
-    timestamp = pb_post.get("timestamp") or pb_post.get("date") or ""
-
-    likes = pb_post.get("likes") or pb_post.get("likeCount") or 0
-    comments = pb_post.get("comments") or pb_post.get("commentCount") or 0
-
-    return {
-        "text": text,
-        "activity_id": activity_id,
-        "post_url": post_url,
-        "author_name": author_name,
-        "author_profile_url": author_profile_url,
-        "timestamp": timestamp,
-        "likes": likes,
-        "comments": comments,
-        "source": "phantombuster",
-    }
+    return normalized
 
 
 def parse_phantombuster_output(
     raw_output: List[Dict[str, Any]],
+    seen_activity_ids: Optional[Set[str]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Parse full PhantomBuster output and normalize all posts
 
     Args:
         raw_output: List of raw post dicts from PhantomBuster
+        seen_activity_ids: Activity IDs to skip before normalizing. IDs of the
+            returned posts are added, so one set can span several outputs.
 
     Returns:
         List of normalized post dicts
@@ -143,9 +125,19 @@ def parse_phantombuster_output(
     """
     normalized_posts = []
     skipped_no_text = 0
+    skipped_seen = 0
 
     for i, raw_post in enumerate(raw_output):
         try:
+            if seen_activity_ids is not None:
+                # Cheap URL-only lookup so known posts skip full normalization
+                activity_id = extract_activity_id_from_url(
+                    raw_post.get("postUrl") or raw_post.get("url") or ""
+                )
+                if activity_id in seen_activity_ids:
+                    skipped_seen += 1
+                    continue
+
             normalized = normalize_post_data(raw_post)
 
             # Skip posts with no text content
@@ -156,6 +148,8 @@ def parse_phantombuster_output(
                 continue
 
             normalized_posts.append(normalized)
+            if seen_activity_ids is not None and activity_id:
+                seen_activity_ids.add(activity_id)
         except Exception as e:
             # Log error but continue processing other posts
             print(f"Warning: Failed to parse post {i}: {e}")
@@ -164,4 +158,7 @@ def parse_phantombuster_output(
     if skipped_no_text > 0:
         print(f"    Skipped {skipped_no_text} items with no text content")
 
+    if skipped_seen > 0:
+        print(f"    Skipped {skipped_seen} already-seen posts")
+
     return normalized_posts
@@ -1,21 +1,27 @@
+import hashlib
 import json
 import re
 import os
 import logging
-import requests
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from openai import OpenAI
 from database import (
     init_database,
-    save_lead,
-    save_activity_id,
-    mark_activity_scraped,
+    save_scraped_posts,
     save_processed_container,
     is_container_processed,
+    save_search_output,
+    get_search_output,
+    get_activity_ids,
     get_processed_containers,
+    save_gpt_analysis,
+    get_gpt_analysis,
 )
-from utils import extract_budget_mention
+from utils import extract_budget_mention, json_dumps, json_loads
 from phantombuster_client import PhantomBusterClient
 from phantombuster_parser import parse_phantombuster_output
 
@@ -33,6 +39,11 @@ MAX_KEYWORDS_IN_QUERY = 15
 MAX_JOB_TITLES_IN_QUERY = 7
 MAX_INDUSTRIES_IN_QUERY = 7
 
+# 19-digit activity ID from the /posts/ path segment, then any 19-digit number
+_ACTIVITY_ID_RE = re.compile(r"/posts/[^/]*?-(\d{19})(?:-|$)")
+_ACTIVITY_ID_FALLBACK_RE = re.compile(r"(\d{19})")
+_AT_SEPARATOR_RE = re.compile(r"\bat\b(.+)", re.IGNORECASE)
+
 
 class ConfigurationError(Exception):
     """Raised when configuration is missing or invalid"""
@@ -115,8 +126,8 @@ def load_config():
 
     # Load keywords from config.json
     try:
-        with open("config.json", "r") as f:
-            json_config = json.load(f)
+        with open("config.json", "rb") as f:
+            json_config = json_loads(f.read())
             config.update(json_config)
     except FileNotFoundError:
         raise ConfigurationError(
@@ -226,14 +237,34 @@ def get_phantombuster_linkedin_posts(config: Dict, date_range_hours: Optional[in
         client = PhantomBusterClient()
 
         all_posts = []
+        # (keyword, raw_output) per search, and keyword per launched container
+        outputs = []
+        launched = {}
+        # Searches fetched within this many seconds are served from the cache
+        cache_ttl = pb_config.get("cache_ttl", 600)
 
         # Launch agent for each keyword search URL
         for i, keyword in enumerate(keywords):
             print(f"\n  [{i+1}/{len(keywords)}] Searching: '{keyword}'")
 
+            cached_output = get_search_output(agent_id, keyword, max_age_seconds=cache_ttl)
+            if cached_output is not None:
+                print(f"    Using cached results (fetched within {cache_ttl}s)")
+                outputs.append((keyword, cached_output))
+                continue
+
             # Try to launch agent with keyword (agent is in Keywords mode)
             print(f"    Launching agent...")
-            launch_result = client.launch_agent(agent_id, keyword)
+            try:
+                launch_result = client.launch_agent(agent_id, keyword)
+            except Exception as e:
+                # Fall back to the last cached results, however old
+                stale_output = get_search_output(agent_id, keyword)
+                if stale_output is None:
+                    raise
+                print(f"    ⚠️  Launch failed ({e}), using last cached results")
+                outputs.append((keyword, stale_output))
+                continue
 
             # Handle two modes: fresh scrape or cached results
             if launch_result["cached"]:
@@ -275,29 +306,52 @@ def get_phantombuster_linkedin_posts(config: Dict, date_range_hours: Optional[in
 
                 # Save this container as processed
                 save_processed_container(container_id, agent_id, keyword, len(raw_output) if isinstance(raw_output, list) else 0)
+                save_search_output(agent_id, keyword, raw_output)
+                outputs.append((keyword, raw_output))
 
             else:
-                # Fresh scrape - agent launched successfully
-                container_id = launch_result["container_id"]
+                # Fresh scrape - agent launched successfully, collected below
+                container_id = str(launch_result["container_id"])
                 print(f"    Container ID: {container_id}")
+                launched[container_id] = keyword
 
-                # Wait for completion
-                poll_interval = pb_config.get("poll_interval", 30)
-                timeout = pb_config.get("timeout", 900)
-
-                print(f"    Waiting for agent to complete (timeout: {timeout}s)...")
-                status = client.wait_for_completion(
-                    agent_id, container_id, poll_interval=poll_interval, timeout=timeout
-                )
-                print(f"    Agent completed successfully")
-
-                # Fetch output
-                print(f"    Fetching results...")
-                raw_output = client.fetch_output(agent_id, container_id)
+        if launched:
+            # Wait for every fresh scrape at once: one status request per poll
+            poll_interval = pb_config.get("poll_interval", 30)
+            timeout = pb_config.get("timeout", 900)
 
-                # Save this container as processed
-                save_processed_container(container_id, agent_id, keyword, len(raw_output) if isinstance(raw_output, list) else 0)
+            print(f"\n  Waiting for {len(launched)} agent run(s) to complete (timeout: {timeout}s)...")
+            finished = client.wait_for_many(
+                agent_id, list(launched), poll_interval=poll_interval, timeout=timeout
+            )
 
+            succeeded = []
+            for container_id, container in finished.items():
+                if container.get("lastEndStatus") == "success":
+                    succeeded.append(container_id)
+                else:
+                    error_msg = container.get("exitMessage", container.get("lastEndStatus") or "Unknown error")
+                    print(f"    ERROR: '{launched[container_id]}' failed: {error_msg}")
+            print(f"  {len(succeeded)} agent run(s) completed successfully")
+
+            # Fetch outputs concurrently (network-bound S3 downloads)
+            print(f"  Fetching results...")
+            with ThreadPoolExecutor(max_workers=min(8, len(succeeded) or 1)) as pool:
+                fetched = pool.map(lambda cid: client.fetch_output(agent_id, cid), succeeded)
+                for container_id, raw_output in zip(succeeded, fetched):
+                    keyword = launched[container_id]
+
+                    # Save this container as processed
+                    save_processed_container(container_id, agent_id, keyword, len(raw_output) if isinstance(raw_output, list) else 0)
+                    save_search_output(agent_id, keyword, raw_output)
+                    outputs.append((keyword, raw_output))
+
+        # Posts already in the database, or in an earlier keyword's results,
+        # are dropped before normalization
+        seen_activity_ids = get_activity_ids("linkedin")
+
+        for keyword, raw_output in outputs:
+            print(f"\n  Results for '{keyword}':")
             print(f"    Raw output type: {type(raw_output)}, length: {len(raw_output) if isinstance(raw_output, list) else 'N/A'}")
 
             # Debug: show first item structure
@@ -306,7 +360,7 @@ def get_phantombuster_linkedin_posts(config: Dict, date_range_hours: Optional[in
                 print(f"    First item sample: {str(raw_output[0])[:200]}")
 
             # Parse and normalize output
-            normalized_posts = parse_phantombuster_output(raw_output)
+            normalized_posts = parse_phantombuster_output(raw_output, seen_activity_ids)
 
             print(f"    Found {len(normalized_posts)} valid posts after parsing")
 
@@ -373,12 +427,12 @@ def extract_activity_id(url: str) -> Optional[str]:
     """
     # Extract 19-digit activity ID from /posts/ path segment
     # Format: /posts/username-ACTIVITYID-hash or /posts/username-ACTIVITYID
-    match = re.search(r"/posts/[^/]*?-(\d{19})(?:-|$)", url)
+    match = _ACTIVITY_ID_RE.search(url)
     if match:
         return match.group(1)
 
     # Fallback: any 19-digit number (less precise but handles edge cases)
-    match = re.search(r"(\d{19})", url)
+    match = _ACTIVITY_ID_FALLBACK_RE.search(url)
     if match:
         logger.debug(f"Extracted activity ID using fallback pattern: {match.group(1)}")
         return match.group(1)
@@ -409,7 +463,7 @@ def extract_company_from_title(title: Optional[str]) -> Optional[str]:
         return None
 
     # Try "at" separator first (case-insensitive)
-    at_match = re.search(r"\bat\b(.+)", title, re.IGNORECASE)
+    at_match = _AT_SEPARATOR_RE.search(title)
     if at_match:
         return at_match.group(1).strip()
 
@@ -526,6 +580,9 @@ def passes_pr_content_filter(post_data: dict, config: dict) -> bool:
     return False
 
 
+# GPT calls run on a thread pool; guards the counters below
+_GPT_STATE_LOCK = threading.Lock()
+
 # Global circuit breaker state
 GPT_FAILURE_COUNT = 0
 GPT_CIRCUIT_BREAKER_THRESHOLD = 5
@@ -569,18 +626,18 @@ def track_gpt_cost(model: str, input_tokens: int, output_tokens: int) -> float:
 
     costs = GPT_MODEL_COSTS[model]
     call_cost = (input_tokens * costs["input"]) + (output_tokens * costs["output"])
-    GPT_COST_THIS_RUN += call_cost
+    with _GPT_STATE_LOCK:
+        GPT_COST_THIS_RUN += call_cost
+        run_cost = GPT_COST_THIS_RUN
 
     logger.info(
         f"GPT call cost: ${call_cost:.4f} (input: {input_tokens}, output: {output_tokens})"
     )
-    logger.info(
-        f"Total cost this run: ${GPT_COST_THIS_RUN:.2f} / ${GPT_MAX_COST_PER_RUN:.2f}"
-    )
+    logger.info(f"Total cost this run: ${run_cost:.2f} / ${GPT_MAX_COST_PER_RUN:.2f}")
 
-    if GPT_COST_THIS_RUN > GPT_MAX_COST_PER_RUN:
+    if run_cost > GPT_MAX_COST_PER_RUN:
         raise Exception(
-            f"Cost limit exceeded: ${GPT_COST_THIS_RUN:.2f} > ${GPT_MAX_COST_PER_RUN:.2f}. "
+            f"Cost limit exceeded: ${run_cost:.2f} > ${GPT_MAX_COST_PER_RUN:.2f}. "
             f"Stopping to prevent runaway costs."
         )
 
@@ -590,7 +647,8 @@ def track_gpt_cost(model: str, input_tokens: int, output_tokens: int) -> float:
 def reset_run_cost():
     """Reset the cost counter for this run"""
     global GPT_COST_THIS_RUN
-    GPT_COST_THIS_RUN = 0.0
+    with _GPT_STATE_LOCK:
+        GPT_COST_THIS_RUN = 0.0
     logger.info("Reset GPT cost counter for new run")
 
 
@@ -650,69 +708,70 @@ def validate_gpt_response(response: dict) -> bool:
 def reset_gpt_circuit_breaker():
     """Reset circuit breaker after successful GPT calls"""
     global GPT_FAILURE_COUNT, GPT_CIRCUIT_BREAKER_ACTIVE
-    GPT_FAILURE_COUNT = 0
-    GPT_CIRCUIT_BREAKER_ACTIVE = False
-
-
-def check_gpt_circuit_breaker() -> bool:
-    """Check if circuit breaker should block GPT calls
-
-    Returns:
-        True if GPT calls should be blocked, False if allowed
-    """
-    global GPT_FAILURE_COUNT, GPT_CIRCUIT_BREAKER_ACTIVE, GPT_CIRCUIT_BREAKER_THRESHOLD
-
-    if GPT_FAILURE_COUNT >= GPT_CIRCUIT_BREAKER_THRESHOLD:
-        GPT_CIRCUIT_BREAKER_ACTIVE = True
-        return True
-
-    return False
+    with _GPT_STATE_LOCK:
+        GPT_FAILURE_COUNT = 0
+        GPT_CIRCUIT_BREAKER_ACTIVE = False
 
 
 def record_gpt_failure():
     """Record a GPT API failure for circuit breaker tracking"""
     global GPT_FAILURE_COUNT
-    GPT_FAILURE_COUNT += 1
+    with _GPT_STATE_LOCK:
+        GPT_FAILURE_COUNT += 1
+        failure_count = GPT_FAILURE_COUNT
     logger.warning(
-        f"GPT API failure recorded. Count: {GPT_FAILURE_COUNT}/{GPT_CIRCUIT_BREAKER_THRESHOLD}"
+        f"GPT API failure recorded. Count: {failure_count}/{GPT_CIRCUIT_BREAKER_THRESHOLD}"
     )
 
 
-def check_daily_gpt_limit() -> bool:
-    """Check if daily GPT call limit has been reached
+def try_reserve_gpt_call() -> Optional[str]:
+    """Check the GPT limits and reserve a call against the daily limit
+
+    The circuit breaker, daily call limit and per-run cost limit are checked
+    and the call is counted in one step under _GPT_STATE_LOCK, so concurrent
+    workers cannot all pass the checks before any of them is counted.
 
     Returns:
-        True if limit reached, False if calls allowed
+        None if the call may go ahead, otherwise the reason it is blocked
     """
-    global GPT_DAILY_CALL_COUNT, GPT_DAILY_CALL_LIMIT, GPT_LAST_RESET_DATE
+    global GPT_DAILY_CALL_COUNT, GPT_LAST_RESET_DATE, GPT_CIRCUIT_BREAKER_ACTIVE
     import datetime
 
     today = datetime.date.today()
 
-    # Reset counter if it's a new day
-    if GPT_LAST_RESET_DATE != today:
-        GPT_DAILY_CALL_COUNT = 0
-        GPT_LAST_RESET_DATE = today
-        logger.info(f"Reset daily GPT call count for {today}")
+    with _GPT_STATE_LOCK:
+        # Reset counter if it's a new day
+        if GPT_LAST_RESET_DATE != today:
+            GPT_DAILY_CALL_COUNT = 0
+            GPT_LAST_RESET_DATE = today
+            logger.info(f"Reset daily GPT call count for {today}")
 
-    # Check if limit reached
-    if GPT_DAILY_CALL_COUNT >= GPT_DAILY_CALL_LIMIT:
-        logger.warning(
-            f"Daily GPT call limit reached: {GPT_DAILY_CALL_COUNT}/{GPT_DAILY_CALL_LIMIT}"
-        )
-        return True
+        if GPT_FAILURE_COUNT >= GPT_CIRCUIT_BREAKER_THRESHOLD:
+            GPT_CIRCUIT_BREAKER_ACTIVE = True
+            return "Circuit breaker active"
 
-    return False
+        if GPT_DAILY_CALL_COUNT >= GPT_DAILY_CALL_LIMIT:
+            logger.warning(
+                f"Daily GPT call limit reached: {GPT_DAILY_CALL_COUNT}/{GPT_DAILY_CALL_LIMIT}"
+            )
+            return "Daily limit reached"
 
+        # A call's cost is only known once it returns, so the run stops
+        # starting new calls as soon as the cap is reached
+        if GPT_COST_THIS_RUN >= GPT_MAX_COST_PER_RUN:
+            logger.warning(
+                f"GPT cost limit reached: ${GPT_COST_THIS_RUN:.2f} / ${GPT_MAX_COST_PER_RUN:.2f}"
+            )
+            return "Cost limit reached"
 
-def record_gpt_call():
-    """Record a successful GPT API call for cost monitoring"""
-    global GPT_DAILY_CALL_COUNT
-    GPT_DAILY_CALL_COUNT += 1
+        GPT_DAILY_CALL_COUNT += 1
+        daily_calls = GPT_DAILY_CALL_COUNT
 
     # Log milestones
-    if GPT_DAILY_CALL_COUNT % 100 == 0:
-        logger.info(f"GPT calls today: {GPT_DAILY_CALL_COUNT}/{GPT_DAILY_CALL_LIMIT}")
+    if daily_calls % 100 == 0:
+        logger.info(f"GPT calls today: {daily_calls}/{GPT_DAILY_CALL_LIMIT}")
+
+    return None
 
 
 def get_gpt_usage_stats() -> dict:
@@ -721,107 +780,67 @@ def get_gpt_usage_stats() -> dict:
     Returns:
         Dictionary with usage stats
     """
-    return {
-        "daily_calls": GPT_DAILY_CALL_COUNT,
-        "daily_limit": GPT_DAILY_CALL_LIMIT,
-        "circuit_breaker_active": GPT_CIRCUIT_BREAKER_ACTIVE,
-        "failure_count": GPT_FAILURE_COUNT,
-        "last_reset_date": str(GPT_LAST_RESET_DATE) if GPT_LAST_RESET_DATE else None,
-    }
-
-
-def analyze_lead_with_gpt(
-    post_content: str,
-    author_name: str,
-    author_title: str,
-    post_url: str,
-    config: dict = None,
-) -> dict:
-    """Use GPT to analyze if this is a genuine PR lead for BDPR
-
-    Args:
-        post_content: LinkedIn post text
-        author_name: Author's name
-        author_title: Author's job title
-        post_url: URL to the post
-        config: Configuration dict with GPT settings
-    """
-    if config is None:
-        config = {}
-
-    # Target data from BDPR requirements PDF
-    target_keywords = [
-        "affiliate PR",
-        "commerce PR",
-        "agency recommendations",
-        "any PR agency recs",
-        "beauty PR agency",
-        "brand launch PR",
-        "brand manager needs PR support",
-        "CMO looking for PR",
-        "comms manager seeking agency",
-        "consumer brand PR",
-        "CPG PR agency",
-        "crisis comms agency",
-        "DTC PR",
-        "direct-to-consumer PR",
-        "food & beverage PR",
-        "hiring a PR agency",
-        "launch PR agency",
-        "looking for a PR agency",
-        "need a PR firm",
-        "PR partner needed",
-        "recommend a PR agency",
-        "RFP for PR",
-        "PR RFP",
-        "seeking PR support",
-    ]
+    with _GPT_STATE_LOCK:
+        return {
+            "daily_calls": GPT_DAILY_CALL_COUNT,
+            "daily_limit": GPT_DAILY_CALL_LIMIT,
+            "circuit_breaker_active": GPT_CIRCUIT_BREAKER_ACTIVE,
+            "failure_count": GPT_FAILURE_COUNT,
+            "last_reset_date": str(GPT_LAST_RESET_DATE) if GPT_LAST_RESET_DATE else None,
+        }
 
-    target_roles = [
-        "Brand Manager",
-        "Senior Brand Manager",
-        "Chief Marketing Officer",
-        "CMO",
-        "Communications Manager",
-        "Director of Marketing",
-        "Director of Brand Marketing",
-        "Director of Corporate Communications",
-        "Head of Communications",
-        "Head of PR",
-        "Marketing Manager",
-        "Senior Marketing Manager",
-        "VP Marketing",
-        "Vice President of Marketing",
-        "Brand Communications Specialist",
-    ]
 
-    target_industries = [
-        "Beauty",
-        "Food and beverage",
-        "CPG",
-        "Consumer goods",
-        "DTC",
-        "Health and wellness",
-        "Personal care",
-        "Skincare",
-        "Haircare",
-        "Makeup",
-        "Fragrance",
-        "Apparel",
-        "Fashion",
-        "Baby products",
-        "Pet products",
-        "Supplements",
-        "Beverages",
-        "Coffee",
-        "Tea",
-        "Energy drinks",
-        "Functional beverages",
-        "Organic",
-        "Natural products",
-    ]
-
-    prompt = f"""Analyze this LinkedIn post to determine if the author is seeking external PR help.
+# Target data from BDPR requirements PDF
+TARGET_ROLES = [
+    "Brand Manager",
+    "Senior Brand Manager",
+    "Chief Marketing Officer",
+    "CMO",
+    "Communications Manager",
+    "Director of Marketing",
+    "Director of Brand Marketing",
+    "Director of Corporate Communications",
+    "Head of Communications",
+    "Head of PR",
+    "Marketing Manager",
+    "Senior Marketing Manager",
+    "VP Marketing",
+    "Vice President of Marketing",
+    "Brand Communications Specialist",
+]
+
+TARGET_INDUSTRIES = [
+    "Beauty",
+    "Food and beverage",
+    "CPG",
+    "Consumer goods",
+    "DTC",
+    "Health and wellness",
+    "Personal care",
+    "Skincare",
+    "Haircare",
+    "Makeup",
+    "Fragrance",
+    "Apparel",
+    "Fashion",
+    "Baby products",
+    "Pet products",
+    "Supplements",
+    "Beverages",
+    "Coffee",
+    "Tea",
+    "Energy drinks",
+    "Functional beverages",
+    "Organic",
+    "Natural products",
+]
+
+# The target lists never change, so render them into the prompt text once
+_TARGET_ROLES_TEXT = repr(TARGET_ROLES)
+_TARGET_INDUSTRIES_TEXT = repr(TARGET_INDUSTRIES)
+
+# Filled in with str.format() per post; literal braces are doubled
+LEAD_ANALYSIS_PROMPT = """Analyze this LinkedIn post to determine if the author is seeking external PR help.
 
 POST CONTENT: "{post_content}"
 AUTHOR: {author_name}
@@ -877,15 +896,59 @@ Respond with JSON only:
     "red_flags": ["any concerning signals"]
 }}"""
 
-    # Check circuit breaker
-    if check_gpt_circuit_breaker():
-        logger.warning("GPT circuit breaker active - skipping GPT analysis")
-        return create_fallback_response("Circuit breaker active")
 
-    # Check daily limit
-    if check_daily_gpt_limit():
-        logger.warning("Daily GPT limit reached - skipping GPT analysis")
-        return create_fallback_response("Daily limit reached")
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI client, so every GPT call reuses one connection pool"""
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def analyze_lead_with_gpt(
+    post_content: str,
+    author_name: str,
+    author_title: str,
+    post_url: str,
+    config: dict = None,
+) -> dict:
+    """Use GPT to analyze if this is a genuine PR lead for BDPR
+
+    Args:
+        post_content: LinkedIn post text
+        author_name: Author's name
+        author_title: Author's job title
+        post_url: URL to the post
+        config: Configuration dict with GPT settings
+    """
+    if config is None:
+        config = {}
+
+    prompt = LEAD_ANALYSIS_PROMPT.format(
+        post_content=post_content,
+        author_name=author_name,
+        author_title=author_title,
+        target_roles=_TARGET_ROLES_TEXT,
+        target_industries=_TARGET_INDUSTRIES_TEXT,
+    )
+
+    # Get model from config, default to gpt-4o-mini for safety
+    gpt_config = config.get("gpt", {})
+    model = gpt_config.get("model", "gpt-4o-mini")
+
+    # Same model and prompt means the same analysis (e.g. a post seen again
+    # under another URL); reuse it for cache_ttl seconds (default 7 days)
+    input_hash = hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+    cached_analysis = get_gpt_analysis(
+        input_hash, max_age_seconds=gpt_config.get("cache_ttl", 7 * 24 * 3600)
+    )
+    if cached_analysis is not None:
+        logger.debug("GPT analysis served from cache")
+        return cached_analysis
+
+    # Check circuit breaker, daily and cost limits, and count this call
+    blocked_reason = try_reserve_gpt_call()
+    if blocked_reason:
+        logger.warning(f"{blocked_reason} - skipping GPT analysis")
+        return create_fallback_response(blocked_reason)
 
     # Retry logic with exponential backoff
     max_retries = 3
@@ -901,10 +964,7 @@ Respond with JSON only:
                 logger.info(f"GPT retry attempt {attempt + 1} after {delay}s delay")
                 time.sleep(delay)
 
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-            # Get model from config, default to gpt-4o-mini for safety
-            model = config.get("gpt", {}).get("model", "gpt-4o-mini")
+            client = get_openai_client()
 
             response = client.chat.completions.create(
                 model=model,
@@ -929,7 +989,7 @@ Respond with JSON only:
             if response_content.endswith("```"):
                 response_content = response_content[:-3]
 
-            result = json.loads(response_content)
+            result = json_loads(response_content)
 
             # Validate response structure
             if not validate_gpt_response(result):
@@ -939,9 +999,13 @@ Respond with JSON only:
             usage = response.usage
             track_gpt_cost(model, usage.prompt_tokens, usage.completion_tokens)
 
-            # Success - reset circuit breaker and record call
+            # Success - reset circuit breaker
             reset_gpt_circuit_breaker()
-            record_gpt_call()
+            try:
+                save_gpt_analysis(input_hash, result)
+            except Exception as e:
+                # A cache write failure must not trigger a second, billed call
+                logger.warning(f"Failed to cache GPT analysis: {e}")
             logger.debug("GPT analysis successful")
             return result
 
@@ -1043,24 +1107,24 @@ def enrich_lead_data(lead_data: dict, config: dict) -> dict:
         {
             "platform": "linkedin",
             "company": company,
-            "matched_keywords": json.dumps(matches["matched_keywords"]),
-            "matched_roles": json.dumps(matches["matched_roles"]),
-            "matched_categories": json.dumps(matches["matched_categories"]),
+            "matched_keywords": json_dumps(matches["matched_keywords"]),
+            "matched_roles": json_dumps(matches["matched_roles"]),
+            "matched_categories": json_dumps(matches["matched_categories"]),
         }
     )
 
     return enriched_data
 
 
-def process_post(post_data: dict, config: dict) -> Optional[dict]:
-    """Process single post into lead data with filtering
+def prefilter_post(post_data: dict, config: dict) -> Optional[dict]:
+    """Validate and keyword-filter a post ahead of GPT analysis
 
     Args:
         post_data: Raw post data
         config: Configuration dictionary
 
     Returns:
-        Lead data dict if post passes filters, None otherwise
+        Lead data dict if the post should go to GPT, None otherwise
     """
     # Validate required fields
     if not validate_post(post_data):
@@ -1074,16 +1138,12 @@ def process_post(post_data: dict, config: dict) -> Optional[dict]:
     if not log_keyword_filter_result(post_data, config):
         return None
 
-    # Show GPT analysis input for debugging
-    author_name = lead_data.get("author_name", "Unknown")
-    print(f"    [GPT ANALYZING] {author_name}")
-    print(f"      Author Title: {lead_data.get('author_title', 'N/A')}")
-    print(
-        f"      Post Content: {lead_data.get('post_content', '')[:150]}{'...' if len(lead_data.get('post_content', '')) > 150 else ''}"
-    )
+    return lead_data
 
-    # Apply GPT analysis for qualified posts
-    gpt_analysis = analyze_lead_with_gpt(
+
+def analyze_lead_data(lead_data: dict, config: dict) -> dict:
+    """Run GPT analysis on prefiltered lead data"""
+    return analyze_lead_with_gpt(
         lead_data["post_content"],
         lead_data["author_name"],
         lead_data["author_title"],
@@ -1091,6 +1151,28 @@ def process_post(post_data: dict, config: dict) -> Optional[dict]:
         config,
     )
 
+
+def apply_gpt_analysis(
+    lead_data: dict, gpt_analysis: dict, config: dict
+) -> Optional[dict]:
+    """Accept or reject prefiltered lead data based on its GPT analysis
+
+    Args:
+        lead_data: Lead data from prefilter_post()
+        gpt_analysis: Result of analyze_lead_data()
+        config: Configuration dictionary
+
+    Returns:
+        Enriched lead data dict if GPT accepted the post, None otherwise
+    """
+    # Show GPT analysis input for debugging
+    author_name = lead_data.get("author_name", "Unknown")
+    print(f"    [GPT ANALYZING] {author_name}")
+    print(f"      Author Title: {lead_data.get('author_title', 'N/A')}")
+    print(
+        f"      Post Content: {lead_data.get('post_content', '')[:150]}{'...' if len(lead_data.get('post_content', '')) > 150 else ''}"
+    )
+
     # Show detailed GPT analysis results
     print(f"    [GPT RESULT] Analysis complete:")
     print(
@@ -1129,11 +1211,29 @@ def process_post(post_data: dict, config: dict) -> Optional[dict]:
 
     # Add GPT analysis results to the lead data
     # Store complete GPT analysis as JSON in raw_data field
-    enriched_data["raw_data"] = json.dumps(gpt_analysis)
+    enriched_data["raw_data"] = json_dumps(gpt_analysis)
 
     return enriched_data
 
 
+def process_post(post_data: dict, config: dict) -> Optional[dict]:
+    """Process single post into lead data with filtering
+
+    Args:
+        post_data: Raw post data
+        config: Configuration dictionary
+
+    Returns:
+        Lead data dict if post passes filters, None otherwise
+    """
+    lead_data = prefilter_post(post_data, config)
+    if not lead_data:
+        return None
+
+    # Apply GPT analysis for qualified posts
+    return apply_gpt_analysis(lead_data, analyze_lead_data(lead_data, config), config)
+
+
 def process_posts_batch(posts: List[Dict], config: Dict) -> int:
     """Process batch of posts with error handling and rollback
 
@@ -1148,8 +1248,14 @@ def process_posts_batch(posts: List[Dict], config: Dict) -> int:
 
     processed_count = 0
     failed_activity_ids = []
+    seen_activity_ids = get_activity_ids("linkedin")
+    # (activity_id, url, None) of posts rejected before GPT
+    filtered_posts = []
+    # (index, activity_id, url, post_data, lead_data) of posts awaiting GPT
+    gpt_candidates = []
 
     for i, post_data in enumerate(posts):
+        activity_id = None
         try:
             activity_id = post_data.get("activity_id")
             url = post_data.get("post_url") or post_data.get("url")
@@ -1162,42 +1268,28 @@ def process_posts_batch(posts: List[Dict], config: Dict) -> int:
                 logger.warning(f"Could not extract activity_id from post: {url}")
                 continue
 
-            # Save activity_id to database (marks as discovered)
-            if not save_activity_id("linkedin", activity_id, url):
-                # Already exists, skip processing
+            # Already recorded by an earlier run (or earlier in this batch)
+            if activity_id in seen_activity_ids:
                 continue
+            seen_activity_ids.add(activity_id)
 
             # Normalize field names for validation
             normalized_post_data = post_data.copy()
             if "post_url" in post_data and "url" not in post_data:
                 normalized_post_data["url"] = post_data["post_url"]
 
-            # Process the post with validation and filtering
-            lead_data = process_post(normalized_post_data, config)
+            # Validate and keyword-filter; GPT runs on the survivors below
+            lead_data = prefilter_post(normalized_post_data, config)
 
             if not lead_data:
                 # Post didn't pass filters - mark as scraped but don't save lead
-                mark_activity_scraped("linkedin", activity_id)
+                filtered_posts.append((activity_id, url, None))
                 print(
                     f"  [{i+1}/{len(posts)}] Skipped: {post_data.get('author_name', 'Unknown')} (filtered out)"
                 )
                 continue
 
-            # Display processing info
-            print(f"  [{i+1}/{len(posts)}] Processing: {lead_data['author_name']}")
-            print(f"    Matched keywords: {lead_data['matched_keywords']}")
-            print(f"    Matched roles: {lead_data['matched_roles']}")
-            print(f"    Matched categories: {lead_data['matched_categories']}")
-
-            # Save lead to database
-            save_lead("linkedin", lead_data["activity_id"], lead_data)
-
-            # Mark as successfully scraped
-            mark_activity_scraped("linkedin", activity_id)
-            processed_count += 1
-            print(
-                f"    Saved lead: {lead_data['author_name']} at {lead_data['company'] or 'Unknown Company'}"
-            )
+            gpt_candidates.append((i, activity_id, url, post_data, lead_data))
 
         except Exception as e:
             logger.error(f"Failed to process post {i+1}: {e}")
@@ -1209,6 +1301,56 @@ def process_posts_batch(posts: List[Dict], config: Dict) -> int:
             print(f"  [{i+1}/{len(posts)}] ERROR processing post: {e}")
             continue
 
+    try:
+        save_scraped_posts("linkedin", filtered_posts)
+    except Exception as e:
+        logger.error(f"Failed to record {len(filtered_posts)} filtered posts: {e}")
+
+    # GPT calls are network-bound, so several run at once on the shared client
+    max_workers = max(1, min(config.get("gpt", {}).get("max_concurrency", 4), len(gpt_candidates)))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(analyze_lead_data, lead_data, config)
+            for _, _, _, _, lead_data in gpt_candidates
+        ]
+
+        # Each result is written as soon as it is ready, so a crash mid-batch
+        # only loses the posts still waiting on GPT
+        for (i, activity_id, url, post_data, lead_data), future in zip(gpt_candidates, futures):
+            try:
+                lead_data = apply_gpt_analysis(lead_data, future.result(), config)
+
+                if not lead_data:
+                    # Rejected by GPT - mark as scraped but don't save lead
+                    save_scraped_posts("linkedin", [(activity_id, url, None)])
+                    print(
+                        f"  [{i+1}/{len(posts)}] Skipped: {post_data.get('author_name', 'Unknown')} (filtered out)"
+                    )
+                    continue
+
+                # Display processing info
+                print(f"  [{i+1}/{len(posts)}] Processing: {lead_data['author_name']}")
+                print(f"    Matched keywords: {lead_data['matched_keywords']}")
+                print(f"    Matched roles: {lead_data['matched_roles']}")
+                print(f"    Matched categories: {lead_data['matched_categories']}")
+
+                # Save lead and mark as scraped together
+                save_scraped_posts("linkedin", [(activity_id, url, lead_data)])
+                processed_count += 1
+                print(
+                    f"    Saved lead: {lead_data['author_name']} at {lead_data['company'] or 'Unknown Company'}"
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to process post {i+1}: {e}")
+
+                # Track failed activity_id for rollback if needed
+                if activity_id:
+                    failed_activity_ids.append(activity_id)
+
+                print(f"  [{i+1}/{len(posts)}] ERROR processing post: {e}")
+                continue
+
     # Report results
     print(f"\nSuccessfully processed {processed_count} posts from PhantomBuster data")
 
@@ -1218,32 +1360,46 @@ def process_posts_batch(posts: List[Dict], config: Dict) -> int:
     return processed_count
 
 
+@lru_cache(maxsize=8)
+def _lowered_terms(
+    terms: Tuple[str, ...], strip_quotes: bool = False
+) -> Tuple[Tuple[str, str], ...]:
+    """(term, lowercased term) pairs, computed once per distinct config list"""
+    if strip_quotes:
+        return tuple((term, term.strip('"').lower()) for term in terms)
+    return tuple((term, term.lower()) for term in terms)
+
+
 def detect_matched_filters(
     post_content: str, author_title: str, config: Dict
 ) -> Dict[str, List[str]]:
     """Detect which keywords, roles, and categories matched in the post"""
     post_lower = post_content.lower()
     title_lower = author_title.lower() if author_title else ""
+    # Roles and categories may match either the title or the post; one scan
+    # of both (newline-separated so no term spans them) per term
+    title_and_post = f"{title_lower}\n{post_lower}"
 
     matched_keywords = []
     matched_roles = []
     matched_categories = []
 
     # Check PR keywords
-    for keyword in config.get("keywords", []):
-        # Strip quotes from keyword for matching (defensive for any quoted keywords)
-        clean_keyword = keyword.strip('"').lower()
+    # Strip quotes from keyword for matching (defensive for any quoted keywords)
+    for keyword, clean_keyword in _lowered_terms(
+        tuple(config.get("keywords", [])), strip_quotes=True
+    ):
         if clean_keyword in post_lower:
             matched_keywords.append(keyword)
 
     # Check role keywords
-    for role in config.get("job_titles", []):
-        if role.lower() in title_lower or role.lower() in post_lower:
+    for role, role_lower in _lowered_terms(tuple(config.get("job_titles", []))):
+        if role_lower in title_and_post:
             matched_roles.append(role)
 
     # Check CPG categories
-    for category in config.get("industries", []):
-        if category.lower() in title_lower or category.lower() in post_lower:
+    for category, category_lower in _lowered_terms(tuple(config.get("industries", []))):
+        if category_lower in title_and_post:
             matched_categories.append(category)
 
     return {
@@ -12,11 +12,10 @@ from typing import List, Dict, Optional
 from twitter_client import TwitterClient
 from database import (
     init_database,
-    save_lead,
-    save_activity_id,
-    mark_activity_scraped,
+    get_activity_ids,
+    save_scraped_posts,
 )
-from utils import extract_budget_mention
+from utils import extract_budget_mention, json_dumps, json_loads
 
 # Setup logging
 logging.basicConfig(
@@ -25,6 +24,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Keywords OR-ed into one search query; every search costs at least one
+# rate-limited request, so grouping cuts requests by up to this factor
+MAX_KEYWORDS_IN_QUERY = 10
+
+
 class ConfigurationError(Exception):
     """Raised when configuration is missing or invalid"""
 
@@ -34,8 +38,8 @@ class ConfigurationError(Exception):
 def load_config() -> Dict:
     """Load configuration from config.json"""
     try:
-        with open("config.json", "r") as f:
-            config = json.load(f)
+        with open("config.json", "rb") as f:
+            config = json_loads(f.read())
     except FileNotFoundError:
         raise ConfigurationError(
             "config.json not found. Copy config.example.json to config.json"
@@ -68,6 +72,34 @@ def get_date_range(hours: Optional[int] = None) -> tuple[date, date]:
     return start_date, end_date
 
 
+def build_keyword_queries(keywords: List[str]) -> List[tuple[str, int]]:
+    """Combine keywords into OR queries of up to MAX_KEYWORDS_IN_QUERY each
+
+    Multi-word keywords are parenthesized so each keeps its own AND semantics,
+    and the whole OR group is parenthesized so filters appended to the query
+    (dates, -is:retweet) apply to every keyword, since AND binds tighter than OR.
+
+    Args:
+        keywords: Configured search keywords
+
+    Returns:
+        List of (query, number of keywords in it) tuples
+    """
+    queries = []
+    for start in range(0, len(keywords), MAX_KEYWORDS_IN_QUERY):
+        group = keywords[start : start + MAX_KEYWORDS_IN_QUERY]
+        if len(group) == 1:
+            queries.append((group[0], 1))
+        else:
+            query = (
+                "("
+                + " OR ".join(f"({keyword})" if " " in keyword else keyword for keyword in group)
+                + ")"
+            )
+            queries.append((query, len(group)))
+    return queries
+
+
 def detect_matched_filters(
     post_content: str, config: Dict
 ) -> Dict[str, List[str]]:
@@ -111,41 +143,32 @@ def build_lead_data_from_tweet(tweet_data: Dict, config: Dict) -> Dict:
     Returns:
         Lead data dictionary
     """
+    get = tweet_data.get
+    text = get("text", "")
+    author_username = get("author_username", "")
+
     # Detect which filters matched
-    matches = detect_matched_filters(tweet_data.get("text", ""), config)
+    matches = detect_matched_filters(text, config)
 
     # Extract budget mention if present
-    budget_mention = extract_budget_mention(tweet_data.get("text", ""))
+    budget_mention = extract_budget_mention(text)
 
     # Build lead data
     return {
-        "author_name": tweet_data.get("author_name", ""),
-        "author_username": tweet_data.get("author_username", ""),
-        "author_handle": tweet_data.get("author_username", ""),  # For compatibility
-        "post_content": tweet_data.get("text", ""),
-        "post_url": tweet_data.get("post_url", ""),
-        "created_at": tweet_data.get("created_at", ""),
-        "matched_keywords": json.dumps(matches["matched_keywords"]),
-        "matched_categories": json.dumps(matches["matched_categories"]),
-        "matched_roles": json.dumps([]),  # Twitter doesn't have job titles
+        "author_name": get("author_name", ""),
+        "author_username": author_username,
+        "author_handle": author_username,  # For compatibility
+        "post_content": text,
+        "post_url": get("post_url", ""),
+        "created_at": get("created_at", ""),
+        "matched_keywords": json_dumps(matches["matched_keywords"]),
+        "matched_categories": json_dumps(matches["matched_categories"]),
+        "matched_roles": "[]",  # Twitter doesn't have job titles
         "budget_mention": budget_mention,
-        "raw_data": tweet_data.get("raw_data", ""),
+        "raw_data": get("raw_data", ""),
     }
 
 
-def is_tweet_already_processed(tweet_id: str, post_url: str) -> bool:
-    """Check if tweet has already been processed (has side effect: saves if new)
-
-    Args:
-        tweet_id: Tweet ID to check
-        post_url: Tweet URL
-
-    Returns:
-        True if already processed, False if new (and saves it)
-    """
-    return not save_activity_id("twitter", tweet_id, post_url)
-
-
 def search_twitter_for_leads(
     config: Dict,
     date_range_hours: Optional[int] = None,
@@ -178,27 +201,31 @@ def search_twitter_for_leads(
 
     start_date, end_date = get_date_range(date_range_hours)
 
+    max_results_per_keyword = twitter_config.get("max_results_per_keyword", 100)
+    queries = build_keyword_queries(keywords)
+
     print(f"Searching Twitter for PR leads...")
-    print(f"  Keywords: {len(keywords)}")
+    print(f"  Keywords: {len(keywords)} ({len(queries)} queries)")
     print(f"  Date range: {start_date} to {end_date} ({date_range_hours}h)")
-    print(f"  Max results per keyword: {twitter_config.get('max_results_per_keyword', 100)}")
+    print(f"  Max results per keyword: {max_results_per_keyword}")
 
     # Use provided client or create new one
     if client is None:
-        client = TwitterClient()
+        client = TwitterClient(store_raw_data=twitter_config.get("store_raw_data", True))
     all_tweets = []
     seen_tweet_ids = set()
 
-    # Search for each keyword
-    for i, keyword in enumerate(keywords):
-        print(f"\n  [{i+1}/{len(keywords)}] Searching: '{keyword}'")
+    # Search each group of keywords; which keywords a tweet matched is
+    # detected locally when building its lead
+    for i, (query, keyword_count) in enumerate(queries):
+        print(f"\n  [{i+1}/{len(queries)}] Searching: '{query}'")
 
         try:
             tweets = client.search_tweets(
-                query=keyword,
+                query=query,
                 start_date=start_date,
                 end_date=end_date,
-                max_results=twitter_config.get("max_results_per_keyword", 100),
+                max_results=max_results_per_keyword * keyword_count,
             )
 
             print(f"    Found {len(tweets)} tweets")
@@ -211,7 +238,7 @@ def search_twitter_for_leads(
                     all_tweets.append(tweet)
 
         except Exception as e:
-            logger.error(f"Error searching keyword '{keyword}': {e}")
+            logger.error(f"Error searching query '{query}': {e}")
             print(f"    ERROR: {e}")
             continue
 
@@ -249,6 +276,11 @@ def main():
     saved_count = 0
     skipped_count = 0
 
+    # Tweets from earlier runs are skipped; new ones are recorded together
+    # with their leads below, so a failed run leaves them to be retried
+    seen_tweet_ids = get_activity_ids("twitter")
+    pending_posts = []
+
     for i, tweet_data in enumerate(tweets):
         try:
             tweet_id = tweet_data.get("id")
@@ -260,20 +292,15 @@ def main():
                 continue
 
             # Check if already processed
-            if is_tweet_already_processed(tweet_id, tweet_data.get("post_url", "")):
+            if tweet_id in seen_tweet_ids:
                 skipped_count += 1
                 print(f"  [{i+1}/{len(tweets)}] Skipped: @{author} (duplicate)")
                 continue
+            seen_tweet_ids.add(tweet_id)
 
             # Build lead data (pure function)
             lead_data = build_lead_data_from_tweet(tweet_data, config)
-
-            # Save to database
-            save_lead("twitter", tweet_id, lead_data)
-            mark_activity_scraped("twitter", tweet_id)
-
-            saved_count += 1
-            print(f"  [{i+1}/{len(tweets)}] Saved: @{author}")
+            pending_posts.append((tweet_id, tweet_data.get("post_url", ""), lead_data))
 
         except KeyError as e:
             logger.error(f"Missing required field in tweet {i+1}: {e}")
@@ -284,6 +311,17 @@ def main():
             print(f"  [{i+1}/{len(tweets)}] ERROR: {e}")
             continue
 
+    # Save leads and mark their tweets as scraped in one transaction
+    try:
+        save_scraped_posts("twitter", pending_posts)
+    except Exception as e:
+        logger.error(f"Failed to save {len(pending_posts)} leads: {e}")
+        print(f"  ERROR: Failed to save leads ({e}); they will be retried next run")
+    else:
+        saved_count = len(pending_posts)
+        for _, _, lead_data in pending_posts:
+            print(f"  Saved: @{lead_data['author_username'] or 'unknown'}")
+
     print(f"\nScraping complete:")
     print(f"  Saved: {saved_count}")
     print(f"  Skipped: {skipped_count}")
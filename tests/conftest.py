@@ -0,0 +1,16 @@
+import pytest
+
+import database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """The database module pointed at a fresh, initialized file"""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "pr_leads.db"))
+    monkeypatch.setattr(database, "_shared_conn", None)
+    monkeypatch.setattr(database, "FTS_ENABLED", database.FTS_ENABLED)
+    monkeypatch.setattr(database, "MATCH_TABLES_ENABLED", database.MATCH_TABLES_ENABLED)
+    database.init_database()
+    yield database
+    if database._shared_conn is not None:
+        database._shared_conn.close()
@@ -0,0 +1,271 @@
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+import database
+
+# Hypothesis reruns the body against the same function-scoped db fixture;
+# each example clears the leads it wrote
+db_settings = settings(
+    max_examples=50, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture]
+)
+
+# The leads/activity_ids schema before the series' migrations
+BASELINE_SCHEMA = """
+    CREATE TABLE leads (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        post_id TEXT UNIQUE NOT NULL,
+        author_name TEXT,
+        author_handle TEXT,
+        author_title TEXT,
+        company_name TEXT,
+        post_content TEXT,
+        post_url TEXT,
+        budget_mention TEXT,
+        created_at TEXT,
+        scraped_at TEXT NOT NULL,
+        matched_keywords TEXT,
+        matched_roles TEXT,
+        matched_categories TEXT,
+        dismissed INTEGER DEFAULT 0,
+        raw_data TEXT,
+        author_username TEXT
+    );
+    CREATE TABLE activity_ids (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        platform TEXT NOT NULL,
+        activity_id TEXT NOT NULL,
+        original_url TEXT,
+        discovered_at TEXT NOT NULL,
+        scraped BOOLEAN DEFAULT 0,
+        UNIQUE(platform, activity_id)
+    );
+    CREATE INDEX idx_platform ON leads(platform);
+    CREATE INDEX idx_scraped_at ON leads(scraped_at);
+"""
+
+
+def lead(created_at="2024-01-01T00:00:00+00:00", **fields):
+    """Lead data as the scrapers pass it to save_scraped_posts"""
+    return {
+        "author_name": "Author",
+        "post_content": "",
+        "created_at": created_at,
+        "matched_keywords": "[]",
+        "matched_roles": "[]",
+        "matched_categories": "[]",
+        **fields,
+    }
+
+
+def save_leads(db, leads):
+    """Save leads under post IDs p0, p1, ... and return their row IDs in order"""
+    db.save_scraped_posts(
+        "linkedin", [(f"p{i}", None, data) for i, data in enumerate(leads)]
+    )
+    with db._connect() as conn:
+        rows = conn.execute("SELECT post_id, id FROM leads").fetchall()
+    ids = dict(rows)
+    return [ids[f"p{i}"] for i in range(len(leads))]
+
+
+def clear_leads(db):
+    with db._connect() as conn:
+        conn.execute("DELETE FROM leads")
+
+
+def lead_ids(db, **filters):
+    return [row["id"] for row in db.get_leads_filtered(**filters)]
+
+
+def test_init_database_migrates_baseline_schema(tmp_path, monkeypatch):
+    path = tmp_path / "pr_leads.db"
+    scraped_at = "2024-03-01T12:30:00"
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        """
+        INSERT INTO leads (platform, post_id, post_content, created_at, scraped_at,
+                           matched_keywords, matched_roles, matched_categories, dismissed)
+        VALUES ('linkedin', ?, ?, ?, ?, ?, '[]', ?, ?)
+    """,
+        [
+            ("old1", "Looking for a PR agency", "2024-03-01T10:00:00+00:00", scraped_at,
+             json.dumps(["PR agency"]), json.dumps(["Café"]), 0),
+            ("old2", "Need a publicist", None, scraped_at, None, None, None),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(database, "DB_NAME", str(path))
+    monkeypatch.setattr(database, "_shared_conn", None)
+    monkeypatch.setattr(database, "FTS_ENABLED", False)
+    monkeypatch.setattr(database, "MATCH_TABLES_ENABLED", False)
+    try:
+        database.init_database()
+        # A second run must be a no-op
+        database.init_database()
+
+        with database._connect() as conn:
+            rows = conn.execute(
+                "SELECT post_id, created_at, dismissed, scraped_at_ts FROM leads ORDER BY id"
+            ).fetchall()
+            indexes = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+            if database.MATCH_TABLES_ENABLED:
+                keywords = conn.execute("SELECT keyword, lead_id FROM lead_keywords").fetchall()
+                categories = conn.execute("SELECT category FROM lead_categories").fetchall()
+
+        expected_ts = int(datetime.fromisoformat(scraped_at).timestamp())
+        assert rows == [
+            ("old1", "2024-03-01T10:00:00+00:00", 0, expected_ts),
+            ("old2", "", 0, expected_ts),
+        ]
+        assert "idx_scraped_at" not in indexes and "idx_platform" not in indexes
+        assert {"idx_leads_scraped_at_ts", "idx_leads_platform_dismissed_created"} <= indexes
+
+        if database.MATCH_TABLES_ENABLED:
+            # Backfilled once, NULL lists contribute no rows
+            assert keywords == [("PR agency", 1)]
+            assert categories == [("Café",)]
+            assert lead_ids(database, keyword="PR agency") == [1]
+            assert lead_ids(database, category="Café") == [1]
+
+        if database.FTS_ENABLED:
+            # Rows that predate leads_fts are indexed by the rebuild
+            assert lead_ids(database, search_text="publicist") == [2]
+    finally:
+        if database._shared_conn is not None:
+            database._shared_conn.close()
+
+
+# LIKE treats % and _ as wildcards, so they are left out of the alphabet
+search_alphabet = st.sampled_from(list("abAB \"'é"))
+
+
+@db_settings
+@given(
+    contents=st.lists(st.text(search_alphabet, max_size=12), max_size=8),
+    search_text=st.text(search_alphabet, min_size=3, max_size=5),
+)
+def test_fts_search_matches_like_search(db, monkeypatch, contents, search_text):
+    if not db.FTS_ENABLED:
+        pytest.skip("SQLite built without FTS5 trigram")
+    clear_leads(db)
+    save_leads(db, [lead(post_content=content) for content in contents])
+
+    fts_ids = lead_ids(db, search_text=search_text)
+    monkeypatch.setattr(db, "FTS_ENABLED", False)
+    like_ids = lead_ids(db, search_text=search_text)
+    monkeypatch.setattr(db, "FTS_ENABLED", True)
+
+    assert fts_ids == like_ids
+
+
+# No case variants (LIKE is case-insensitive for ASCII, = is not) and no LIKE
+# wildcards; Café and the quoted role differ between the two JSON encodings
+match_values = ["PR", "Beauty", "Café", "CMO", 'Head of "PR"']
+value_lists = st.lists(st.sampled_from(match_values), max_size=3, unique=True)
+
+
+@db_settings
+@given(
+    leads=st.lists(
+        st.tuples(value_lists, value_lists, value_lists, st.booleans()), max_size=8
+    ),
+    column=st.sampled_from(["category", "role", "keyword"]),
+    value=st.sampled_from(match_values),
+)
+def test_match_table_filters_match_like_filters(db, monkeypatch, leads, column, value):
+    if not db.MATCH_TABLES_ENABLED:
+        pytest.skip("SQLite built without JSON support")
+    clear_leads(db)
+
+    def encode(values, ascii_only):
+        return json.dumps(values, ensure_ascii=ascii_only)
+
+    save_leads(db, [
+        lead(
+            matched_categories=encode(categories, ascii_only),
+            matched_roles=encode(roles, ascii_only),
+            matched_keywords=encode(keywords, ascii_only),
+        )
+        for categories, roles, keywords, ascii_only in leads
+    ])
+
+    match_ids = lead_ids(db, **{column: value})
+    monkeypatch.setattr(db, "MATCH_TABLES_ENABLED", False)
+    like_ids = lead_ids(db, **{column: value})
+    monkeypatch.setattr(db, "MATCH_TABLES_ENABLED", True)
+
+    assert match_ids == like_ids
+
+
+@db_settings
+@given(
+    created_ats=st.lists(
+        st.sampled_from(["", "2024-01-01T00:00:00+00:00", "2024-01-02T00:00:00+00:00"]),
+        max_size=12,
+    ),
+    page_size=st.integers(min_value=1, max_value=4),
+)
+def test_keyset_pages_cover_every_lead_once(db, created_ats, page_size):
+    clear_leads(db)
+    save_leads(db, [lead(created_at=created_at) for created_at in created_ats])
+
+    paged = []
+    after = None
+    while True:
+        page = db.get_leads_filtered(limit=page_size, after=after)
+        paged.extend(row["id"] for row in page)
+        if len(page) < page_size:
+            break
+        after = (page[-1]["created_at"], page[-1]["id"])
+
+    assert paged == lead_ids(db)
+    assert len(paged) == len(created_ats)
+
+
+def activity_rows(db):
+    with db._connect() as conn:
+        return conn.execute(
+            "SELECT platform, activity_id, scraped FROM activity_ids ORDER BY activity_id"
+        ).fetchall()
+
+
+def test_save_scraped_posts_rolls_back_on_failure(db):
+    posts = [
+        ("a1", "https://example.com/a1", None),
+        ("a2", "https://example.com/a2", lead(post_content="Need a publicist")),
+        # Not bindable as a column value, so the leads insert fails
+        ("a3", "https://example.com/a3", lead(author_name={"name": "Bad"})),
+    ]
+
+    with pytest.raises(sqlite3.Error):
+        db.save_scraped_posts("linkedin", posts)
+
+    assert activity_rows(db) == []
+    assert lead_ids(db) == []
+    assert db.get_activity_ids("linkedin") == set()
+
+
+def test_save_scraped_posts_records_posts_and_leads(db):
+    posts = [
+        ("a1", "https://example.com/a1", None),
+        ("a2", "https://example.com/a2", lead(post_content="Need a publicist")),
+    ]
+
+    assert db.save_scraped_posts("linkedin", posts) == 1
+    # Saving the same posts again marks them scraped without duplicating the lead
+    assert db.save_scraped_posts("linkedin", posts) == 0
+
+    assert activity_rows(db) == [("linkedin", "a1", 1), ("linkedin", "a2", 1)]
+    assert [row["post_content"] for row in db.get_leads_filtered()] == ["Need a publicist"]
+    assert db.get_activity_ids("linkedin") == {"a1", "a2"}
@@ -0,0 +1,66 @@
+from datetime import date
+
+import scraper_twitter
+from scraper_twitter import MAX_KEYWORDS_IN_QUERY, build_keyword_queries, search_twitter_for_leads
+from twitter_client import TwitterClient
+
+
+class RecordingClient:
+    """Stands in for TwitterClient and records each search_tweets query"""
+
+    def __init__(self):
+        self.queries = []
+
+    def search_tweets(self, query, start_date, end_date, max_results=100):
+        self.queries.append(query)
+        return []
+
+
+def test_single_keyword_query_is_the_keyword():
+    assert build_keyword_queries(["pr agency"]) == [("pr agency", 1)]
+
+
+def test_keyword_group_is_parenthesized_as_a_whole():
+    queries = build_keyword_queries(["publicist", "pr agency", "pr firm"])
+
+    assert queries == [("(publicist OR (pr agency) OR (pr firm))", 3)]
+
+
+def test_keywords_split_into_groups_of_max_size():
+    keywords = [f"kw{i}" for i in range(MAX_KEYWORDS_IN_QUERY + 1)]
+
+    queries = build_keyword_queries(keywords)
+
+    assert [count for _, count in queries] == [MAX_KEYWORDS_IN_QUERY, 1]
+    assert queries[0][0] == "(" + " OR ".join(keywords[:-1]) + ")"
+    assert queries[1][0] == keywords[-1]
+
+
+def test_search_passes_grouped_queries_to_client(monkeypatch):
+    monkeypatch.setattr(
+        scraper_twitter, "get_date_range", lambda hours: (date(2024, 1, 1), date(2024, 1, 2))
+    )
+    client = RecordingClient()
+    config = {"keywords": ["publicist", "need pr help"], "twitter": {}}
+
+    search_twitter_for_leads(config, date_range_hours=24, client=client)
+
+    assert client.queries == ["(publicist OR (need pr help))"]
+
+
+def test_date_and_retweet_filters_apply_to_the_whole_group(monkeypatch):
+    client = TwitterClient(api_key="test-key")
+    sent = []
+    monkeypatch.setattr(
+        client, "_fetch_tweet_ids", lambda query, max_results: sent.append(query) or []
+    )
+
+    client.search_tweets(
+        query="(publicist OR (need pr help))",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 1, 2),
+    )
+
+    assert sent == [
+        "(publicist OR (need pr help)) since:2024-01-01 until:2024-01-02 -is:retweet"
+    ]
@@ -7,10 +7,13 @@ import os
 import time
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import date, datetime
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
 from types_twitter import TweetId, TwitterUsername
+from utils import json_dumps, json_loads
 
 load_dotenv()
 
@@ -24,23 +27,44 @@ class TwitterClient:
     RATE_LIMIT_DELAY = 8  # seconds between requests (free tier: 1 req/5 sec + buffer)
     TWEETS_PER_PAGE = 20  # TwitterAPI.io returns 20 tweets per page
     REQUEST_TIMEOUT = 30  # seconds
+    TWEETS_PER_LOOKUP = 100  # IDs per tweets-by-ID request, keeps the URL bounded
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, store_raw_data: bool = True):
         """
         Initialize Twitter API client
 
         Args:
             api_key: twitterapi.io API key. If None, reads from TWITTER_API_KEY env var
+            store_raw_data: Serialize each full API tweet into raw_data (default True)
         """
         self.api_key = api_key or os.getenv("TWITTER_API_KEY")
         if not self.api_key:
             raise ValueError("Twitter API key required. Set TWITTER_API_KEY in .env")
+        self.store_raw_data = store_raw_data
 
         self.headers = {
             "x-api-key": self.api_key,
             "Content-Type": "application/json",
         }
 
+        # One keep-alive session for every page and keyword, so only the first
+        # request pays the TCP/TLS handshake
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+        # Retry 429/5xx with backoff (honouring Retry-After) so one transient
+        # failure doesn't drop a keyword's results. raise_on_status=False hands
+        # the last response back to the status_code checks below.
+        retry = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
+
     def search_tweets(
         self,
         query: str,
@@ -65,7 +89,7 @@ class TwitterClient:
                 - author_username: Author's @username
                 - created_at: Tweet timestamp (ISO format)
                 - post_url: URL to tweet
-                - raw_data: Full tweet data (JSON string)
+                - raw_data: Full tweet data (JSON string, "" if store_raw_data is off)
         """
         # Build query with date filters and exclude retweets
         formatted_query = (
@@ -84,7 +108,11 @@ class TwitterClient:
             return []
 
         # Get full tweet data
-        tweets = self._fetch_tweets_by_ids(tweet_ids)
+        tweets = []
+        for start in range(0, len(tweet_ids), self.TWEETS_PER_LOOKUP):
+            tweets.extend(
+                self._fetch_tweets_by_ids(tweet_ids[start : start + self.TWEETS_PER_LOOKUP])
+            )
 
         logger.info(f"Found {len(tweets)} tweets")
         return tweets
@@ -106,15 +134,15 @@ class TwitterClient:
 
                 logger.debug(f"Fetching page {page_num + 1}/{pages_needed}")
 
-                response = requests.get(
-                    url, headers=self.headers, params=params, timeout=self.REQUEST_TIMEOUT
+                response = self.session.get(
+                    url, params=params, timeout=self.REQUEST_TIMEOUT
                 )
 
                 if response.status_code != 200:
                     logger.error(f"API request failed: {response.status_code} - {response.text}")
                     break
 
-                data = response.json()
+                data = json_loads(response.content)
 
                 # Collect tweet IDs from this page
                 page_tweets = data.get("tweets", [])
@@ -172,15 +200,15 @@ class TwitterClient:
 
             logger.debug(f"Fetching {len(tweet_ids)} tweets by IDs")
 
-            response = requests.get(
-                url, headers=self.headers, params=params, timeout=self.REQUEST_TIMEOUT
+            response = self.session.get(
+                url, params=params, timeout=self.REQUEST_TIMEOUT
             )
 
             if response.status_code != 200:
                 logger.error(f"API request failed: {response.status_code} - {response.text}")
                 return []
 
-            data = response.json()
+            data = json_loads(response.content)
 
             # Process tweets from response
             tweet_list = data.get("tweets", [])
@@ -249,9 +277,7 @@ class TwitterClient:
             post_url = f"https://twitter.com/{author_username}/status/{tweet_id}" if author_username else ""
 
             # Store full tweet data as JSON for dashboard display
-            import json
-
-            raw_data = json.dumps(tweet_data)
+            raw_data = json_dumps(tweet_data) if self.store_raw_data else ""
 
             return {
                 "id": tweet_id,
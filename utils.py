@@ -1,19 +1,32 @@
+import json
 import re
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used without it
+    orjson = None
 
-def extract_budget_mention(text: str) -> Optional[str]:
-    """Extract budget/retainer mentions from post text"""
-    patterns = [
+
+# Tried in order: an earlier pattern wins even if a later one matches further
+# left, so these stay separate rather than one alternation
+_BUDGET_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
         r"\$[\d,]+(?:k|K)?(?:\s*(?:-|to)\s*\$[\d,]+(?:k|K)?)?",
         r"budget.*?\$[\d,]+",
         r"retainer.*?\$[\d,]+",
         r"[\d,]+k?\s*(?:per|/)\s*month",
-    ]
+    )
+)
 
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+
+def extract_budget_mention(text: str) -> Optional[str]:
+    """Extract budget/retainer mentions from post text"""
+    for pattern in _BUDGET_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(0)
     return None
@@ -100,3 +113,38 @@ def format_relative_time(timestamp: str) -> str:
 
     except (ValueError, AttributeError):
         return "unknown time"
+
+
+def json_loads(raw):
+    """Decode JSON text (str or bytes), with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Encode obj as a JSON string, with orjson when it is installed
+
+    Args:
+        obj: Value to encode
+        indent: Pretty-print with 2-space indentation (for config files)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+@lru_cache(maxsize=4096)
+def parse_json_list(raw: Optional[str]) -> Tuple:
+    """Parse a JSON-encoded list column (e.g. matched_keywords)
+
+    Memoized on the raw string: the dashboard re-renders the same leads on
+    every rerun, so repeat parses become a dict lookup.
+
+    Args:
+        raw: JSON array string, or None/empty
+
+    Returns:
+        Tuple of the list items (immutable so cached values can't be mutated)
+    """
+    return tuple(json_loads(raw or "[]"))